@@ -0,0 +1,95 @@
+# Benchmark: legacy JSON path vs orjson rendering on real standings and roster payloads
+#
+# Usage (from backend/):  python benchmarks/bench_json.py [--iterations 500] [--team-id 1610612747]
+#
+# Frames come from the persistent upstream store when the server has already cached them,
+# otherwise they are fetched live from stats.nba.com.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from nba_api.stats.endpoints import commonteamroster, leaguestandings
+
+from responses import dumps
+from serializers import frame_to_records
+from upstream_store import UpstreamStore
+
+
+def legacy_convert_numpy_types(obj):
+    """The recursive walker the API used before the orjson response class"""
+    if isinstance(obj, dict):
+        return {key: legacy_convert_numpy_types(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_convert_numpy_types(item) for item in obj]
+    elif isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif pd.isna(obj):
+        return None
+    return obj
+
+
+def legacy_render(df):
+    # iterrows rows -> convert_numpy_types -> jsonable_encoder -> json.dumps (as JSONResponse.render)
+    rows = [row.to_dict() for _, row in df.iterrows()]
+    content = jsonable_encoder(legacy_convert_numpy_types(rows))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def fast_render(df, fields):
+    return dumps(frame_to_records(df, fields))
+
+
+def load_frame(store, endpoint_cls, **params):
+    stored = store.get(endpoint_cls.__name__, params) if store else None
+    if stored is not None:
+        return stored.frames[0], "persistent store"
+    return endpoint_cls(**params).get_data_frames()[0], "live NBA API"
+
+
+def time_it(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--team-id", type=int, default=1610612747)
+    args = parser.parse_args()
+
+    # Import lazily so the field maps match exactly what the API serves
+    from main import ROSTER_FIELDS, STANDINGS_FIELDS
+
+    try:
+        store = UpstreamStore()
+    except Exception:
+        store = None
+
+    payloads = [
+        ("standings", *load_frame(store, leaguestandings.LeagueStandings), STANDINGS_FIELDS),
+        ("roster", *load_frame(store, commonteamroster.CommonTeamRoster, team_id=args.team_id), ROSTER_FIELDS),
+    ]
+
+    print(f"{'payload':<10} {'rows':>5} {'legacy ms':>10} {'orjson ms':>10} {'speedup':>8}  source")
+    for name, df, source, fields in payloads:
+        legacy_ms = time_it(lambda: legacy_render(df), args.iterations)
+        fast_ms = time_it(lambda: fast_render(df, fields), args.iterations)
+        print(f"{name:<10} {len(df):>5} {legacy_ms:>10.3f} {fast_ms:>10.3f} {legacy_ms / fast_ms:>7.1f}x  {source}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Benchmark: per-worker memory of the static player/team registries
+#
+# Usage (from backend/):  python benchmarks/bench_registry_memory.py [--workers 4]
+#
+# Each variant is built in a fresh interpreter (like a uvicorn worker) after nba_api's
+# bundled static data is imported, so the numbers are only what the registry itself adds:
+#   legacy   teams.get_teams() + players.get_players() lists of dicts (the old startup caches)
+#   compact  PlayerRegistry columns (teams are served from TEAM_INDEX in both cases)
+#   search   PlayerRegistry plus the PlayerSearchIndex built over it
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER_SCRIPT = r"""
+import gc, json, sys, time, tracemalloc
+sys.path.insert(0, BACKEND_DIR)
+import numpy as np
+from nba_api.stats.library import data
+from nba_api.stats.static import players, teams
+from model_registry import process_rss_bytes
+
+gc.collect()
+rss_before = process_rss_bytes()
+if TRACE:
+    tracemalloc.start()
+started = time.perf_counter()
+if VARIANT == "legacy":
+    registry = (teams.get_teams(), players.get_players())
+else:
+    from player_registry import PlayerRegistry
+    registry = PlayerRegistry.from_static()
+    if VARIANT == "search":
+        from player_search import PlayerSearchIndex
+        index = PlayerSearchIndex(registry)
+build_ms = (time.perf_counter() - started) * 1000
+gc.collect()
+traced = tracemalloc.get_traced_memory()[0] if TRACE else None
+print(json.dumps({"rss_before": rss_before, "rss_after": process_rss_bytes(), "traced": traced, "build_ms": build_ms}))
+"""
+
+
+def run_worker(variant, trace):
+    script = f"BACKEND_DIR = {BACKEND_DIR!r}\nVARIANT = {variant!r}\nTRACE = {trace!r}\n" + WORKER_SCRIPT
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(variant):
+    """RSS and build time from an untraced worker (tracemalloc inflates both), bytes from a traced one"""
+    result = run_worker(variant, trace=False)
+    result["traced"] = run_worker(variant, trace=True)["traced"]
+    return result
+
+
+def deep_size(value, seen=None):
+    """Approximate bytes held by a nested dict/list structure (shared objects counted once)"""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(deep_size(item, seen) for item in value)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker memory of the static registries")
+    parser.add_argument("--workers", type=int, default=4, help="Worker count used for the totals")
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    from nba_teams_database import NBA_TEAMS_DATA
+
+    print(f"{'variant':<8} {'RSS before':>11} {'RSS after':>10} {'RSS delta':>10} {'traced':>9} {'build':>8}"
+          f" {'x' + str(args.workers) + ' workers':>12}")
+    for variant in ("legacy", "compact", "search"):
+        result = measure(variant)
+        delta = result["rss_after"] - result["rss_before"]
+        print(f"{variant:<8} {result['rss_before'] / 2**20:9.1f}MB {result['rss_after'] / 2**20:8.1f}MB"
+              f" {delta / 2**20:8.2f}MB {result['traced'] / 2**20:7.2f}MB {result['build_ms']:6.1f}ms"
+              f" {args.workers * delta / 2**20:10.2f}MB")
+    print(f"NBA_TEAMS_DATA (30 teams, nested dicts): {deep_size(NBA_TEAMS_DATA) / 1024:.1f} KB per worker")
+
+
+if __name__ == "__main__":
+    main()
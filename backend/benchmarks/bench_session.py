@@ -0,0 +1,141 @@
+# Benchmark: per-call nba_api latency with a fresh connection per request vs the pooled session
+#
+# Usage (from backend/):  python benchmarks/bench_session.py [--calls 200] [--threads 4] [--tls]
+#
+# A local stub server stands in for stats.nba.com, so no real upstream traffic is made.
+# With --tls the stub serves HTTPS with a throwaway self-signed certificate (needs the
+# openssl CLI), which shows the handshake cost that dominates against the real API.
+
+import argparse
+import http.server
+import json
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+import urllib3
+from nba_api.stats.endpoints import commonplayerinfo
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from upstream_http import PooledSession, install_pooled_session, uninstall_pooled_session
+
+
+def stub_payload():
+    """A CommonPlayerInfo-shaped response with one row per result set"""
+    result_sets = []
+    for name, headers in commonplayerinfo.CommonPlayerInfo.expected_data.items():
+        result_sets.append({"name": name, "headers": headers, "rowSet": [[1] * len(headers)]})
+    return json.dumps({"resource": "commonplayerinfo", "parameters": {}, "resultSets": result_sets}).encode()
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Send headers and body in one write with Nagle off, like a real server
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    body = stub_payload()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def self_signed_context(directory):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+def start_stub(tls, directory):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    scheme = "http"
+    if tls:
+        server.socket = self_signed_context(directory).wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/stats/{{endpoint}}"
+
+
+def run(calls, threads):
+    def one_call(player_id):
+        started = time.perf_counter()
+        commonplayerinfo.CommonPlayerInfo(player_id=player_id, timeout=10).get_data_frames()
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        started = time.perf_counter()
+        latencies = list(pool.map(one_call, range(calls)))
+        return latencies, time.perf_counter() - started
+
+
+def report(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(latencies) * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms   "
+          f"throughput {len(latencies) / elapsed:7.1f} calls/s")
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--tls", action="store_true", help="serve the stub over HTTPS")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server, base_url = start_stub(args.tls, directory)
+        original_base_url = NBAStatsHTTP.base_url
+        NBAStatsHTTP.base_url = base_url
+        print(f"Stub server at {base_url.split('/stats')[0]}, {args.calls} calls on {args.threads} threads\n")
+
+        try:
+            if args.tls:
+                # Self-signed stub certificate: skip verification for both variants
+                urllib3.disable_warnings()
+                original_get = requests.get
+                requests.get = lambda *a, **kw: original_get(*a, verify=False, **kw)
+
+            uninstall_pooled_session()
+            fresh_mean = report("fresh connection", *run(args.calls, args.threads))
+
+            session = PooledSession(pool_size=args.threads)
+            if args.tls:
+                session.session.verify = False
+                session.session.trust_env = False  # a CA bundle from the environment would override verify
+            install_pooled_session(session)
+            pooled_mean = report("pooled keep-alive", *run(args.calls, args.threads))
+            stats = session.stats()
+            print(f"\nPooled session: {stats['requests_sent']} requests over {stats['connections_opened']} connections")
+            print(f"Mean latency reduced {fresh_mean / pooled_mean:.1f}x")
+        finally:
+            if args.tls:
+                requests.get = original_get
+            uninstall_pooled_session()
+            NBAStatsHTTP.base_url = original_base_url
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Cold-start profile and budget check for the API
+#
+# Usage (from backend/):  python benchmarks/startup_profile.py [--top 25] [--runs 3]
+#                                                         [--budget-ms 3000] [--check]
+#
+# Every measurement runs in a fresh interpreter, like a new uvicorn worker or a --reload
+# restart: import main, then run the startup handlers. The profile pass uses
+# python -X importtime and lists the costliest imports and packages; the timing passes run
+# without it. With --check the script exits non-zero when the fastest cold start exceeds
+# the budget (STARTUP_BUDGET_MS) or a module that must load lazily was imported at startup.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported until a request needs them
+LAZY_MODULES = ["pandas", "pyarrow", "nba_api.stats.endpoints", "sklearn"]
+
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "3000"))
+
+CHILD_SCRIPT = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, BACKEND_DIR)
+import main
+imported = time.perf_counter()
+
+async def start_and_stop():
+    await main.app.router.startup()
+    ready = time.perf_counter()
+    await main.app.router.shutdown()
+    return ready
+
+ready = asyncio.run(start_and_stop())
+print(json.dumps({
+    "ready_wall": time.time(),
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "loaded": sorted(name for name in LAZY_MODULES if name in sys.modules),
+}))
+"""
+
+# Keep the child from doing background network work while it is measured
+CHILD_ENV = {
+    "PREWARM_ENABLED": "0",
+    "WAREHOUSE_INGEST_INTERVAL_SECONDS": "0",
+    "MODEL_RELOAD_INTERVAL_SECONDS": "0",
+}
+
+
+def run_child(importtime=False):
+    script = f"BACKEND_DIR = {BACKEND_DIR!r}\nLAZY_MODULES = {LAZY_MODULES!r}\n" + CHILD_SCRIPT
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", script]
+    spawned = time.time()
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=BACKEND_DIR,
+                               env={**os.environ, **CHILD_ENV})
+    if completed.returncode != 0:
+        sys.exit(f"❌ Startup failed:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    # Interpreter start + imports + startup handlers, as a worker experiences it
+    result["cold_start_ms"] = (result["ready_wall"] - spawned) * 1000
+    return result, completed.stderr
+
+
+def parse_importtime(stderr):
+    """(module, self_ms, cumulative_ms) per line of python -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+
+def print_profile(rows, top):
+    print(f"\n🐢 Slowest imports (cumulative, top {top})")
+    for name, self_ms, cumulative_ms in sorted(rows, key=lambda row: -row[2])[:top]:
+        print(f"   {cumulative_ms:8.1f} ms  (self {self_ms:7.1f})  {name}")
+
+    packages = {}
+    for name, self_ms, _ in rows:
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0.0) + self_ms
+    print(f"\n📦 Import cost by top-level package (self time, top {top})")
+    for root, total_ms in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"   {total_ms:8.1f} ms  {root}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile API cold start and check it against a budget")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--runs", type=int, default=3, help="Timing runs; the fastest one is checked")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--check", action="store_true", help="Exit 1 when over budget or a lazy module loaded")
+    parser.add_argument("--no-profile", action="store_true", help="Skip the -X importtime pass")
+    args = parser.parse_args()
+
+    if not args.no_profile:
+        _, stderr = run_child(importtime=True)
+        print_profile(parse_importtime(stderr), args.top)
+
+    runs = [run_child()[0] for _ in range(args.runs)]
+    fastest = min(runs, key=lambda run: run["cold_start_ms"])
+    print("\n⏱️ Cold start (fastest of {}): {:.0f} ms = import main {:.0f} ms + startup handlers {:.0f} ms"
+          " + interpreter".format(args.runs, fastest["cold_start_ms"], fastest["import_ms"], fastest["startup_ms"]))
+    all_runs = ", ".join(f"{run['cold_start_ms']:.0f}" for run in runs)
+    print(f"   all runs: {all_runs} ms; budget {args.budget_ms:.0f} ms")
+
+    failures = []
+    if fastest["cold_start_ms"] > args.budget_ms:
+        failures.append(f"cold start {fastest['cold_start_ms']:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    if fastest["loaded"]:
+        failures.append(f"imported at startup but should load lazily: {', '.join(fastest['loaded'])}")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        if args.check:
+            sys.exit(1)
+    else:
+        print("✅ Within the startup budget; heavy modules load on first use")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# In-memory response caching for the NBA Analytics API
+# Entries expire after a TTL and the cache is bounded with LRU eviction.
+# Hot league-wide payloads can instead be served stale-while-revalidate.
+
+import asyncio
+import time
+from collections import OrderedDict, namedtuple
+
+# Loader result for StaleWhileRevalidateCache carrying when the data was fetched upstream;
+# a plain return value counts as fetched now
+Fetched = namedtuple("Fetched", ["value", "fetched_at"])
+
+
+class DataTooOldError(Exception):
+    """Raised when a loader only has data older than the cache's hard TTL"""
+
+
+def make_cache_key(route: str, **params) -> tuple:
+    """Build a hashable cache key from a route name and its parameters"""
+    return (route,) + tuple(sorted(params.items()))
+
+
+class TTLCache:
+    """Bounded in-memory cache with per-entry TTL, LRU eviction and hit/miss counters"""
+
+    def __init__(self, ttl_seconds=300, max_size=512):  # 5 minutes default
+        self.cache = OrderedDict()
+        self.ttl = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set(self, key, value, ttl_seconds=None):
+        self.cache[key] = {
+            'value': value,
+            'timestamp': time.monotonic(),
+            'ttl': ttl_seconds if ttl_seconds is not None else self.ttl
+        }
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        entry = self.cache.get(key)
+        if entry is not None:
+            if time.monotonic() - entry['timestamp'] < entry['ttl']:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return entry['value']
+            del self.cache[key]
+        self.misses += 1
+        return None
+
+    def pop(self, key):
+        """Remove an entry so the next lookup rebuilds it"""
+        entry = self.cache.pop(key, None)
+        return entry['value'] if entry is not None else None
+
+    def clear_expired(self):
+        current_time = time.monotonic()
+        expired_keys = [
+            key for key, entry in self.cache.items()
+            if current_time - entry['timestamp'] >= entry['ttl']
+        ]
+        for key in expired_keys:
+            del self.cache[key]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.cache),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+class StaleWhileRevalidateCache:
+    """Serves the last good payload immediately and refreshes it in the background
+
+    Entries younger than soft_ttl are fresh. Between soft_ttl and hard_ttl the stored
+    payload is still returned at once while a single background refresh runs. Past
+    hard_ttl (or on a cold start) the caller waits for the loader.
+
+    Ages count from when the data was fetched upstream: loaders returning Fetched pass
+    that time in, and data already older than hard_ttl is refused.
+    """
+
+    def __init__(self, soft_ttl=300, hard_ttl=6 * 3600):
+        self.entries = {}
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self._refreshing = {}
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.too_old = 0
+
+    def _start_refresh(self, key, loader):
+        task = self._refreshing.get(key)
+        if task is None:
+            self.refreshes += 1
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda t: self._finish_refresh(key, t))
+        return task
+
+    def _finish_refresh(self, key, task):
+        self._refreshing.pop(key, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.refresh_failures += 1
+            print(f"⚠️ Background refresh failed for {key}: {error}")
+
+    async def _load(self, key, loader):
+        result = await loader()
+        value, fetched_at = result if isinstance(result, Fetched) else (result, time.time())
+        if time.time() - fetched_at >= self.hard_ttl:
+            self.too_old += 1
+            raise DataTooOldError(f"{key} loader returned data {int(time.time() - fetched_at)}s old")
+        entry = self.entries.get(key)
+        # A fallback to older data must not replace a newer entry
+        if entry is None or fetched_at >= entry['timestamp']:
+            self.entries[key] = {'value': value, 'timestamp': fetched_at}
+        return value
+
+    def is_fresh(self, key):
+        entry = self.entries.get(key)
+        return entry is not None and time.time() - entry['timestamp'] < self.soft_ttl
+
+    async def refresh(self, key, loader):
+        """Reload an entry now (joining a refresh that is already running)"""
+        return await asyncio.shield(self._start_refresh(key, loader))
+
+    async def get(self, key, loader):
+        """Return (value, age_seconds, is_stale), loading inline only when nothing usable is stored"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            age = time.time() - entry['timestamp']
+            if age < self.soft_ttl:
+                self.fresh_hits += 1
+                return entry['value'], age, False
+            if age < self.hard_ttl:
+                self.stale_hits += 1
+                self._start_refresh(key, loader)
+                return entry['value'], age, True
+        self.misses += 1
+        await asyncio.shield(self._start_refresh(key, loader))
+        entry = self.entries[key]
+        age = time.time() - entry['timestamp']
+        return entry['value'], age, age >= self.soft_ttl
+
+    def stats(self):
+        return {
+            "size": len(self.entries),
+            "soft_ttl_seconds": self.soft_ttl,
+            "hard_ttl_seconds": self.hard_ttl,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "too_old": self.too_old,
+            "refreshing": len(self._refreshing)
+        }
@@ -0,0 +1,194 @@
+# Response compression with precompressed bodies reused per ETag
+# JSON API payloads are negotiated to brotli or gzip. A body that carries an ETag is
+# compressed once per encoding and reused until the ETag (i.e. the content) changes.
+
+import gzip
+import os
+import time
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are sent as-is (the headers would eat the savings)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "6"))
+# Number of (etag, encoding) compressed bodies kept in memory
+COMPRESSION_CACHE_SIZE = int(os.getenv("COMPRESSION_CACHE_SIZE", "512"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def _compress_gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _compress_brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+
+
+ENCODERS = {"gzip": _compress_gzip}
+if brotli is not None:
+    ENCODERS["br"] = _compress_brotli
+# Server preference when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding) -> str:
+    """Pick the best supported encoding from an Accept-Encoding header, or None"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in ENCODERS:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionStats:
+    """Precompressed body cache plus per-route compression counters"""
+
+    def __init__(self, max_size=COMPRESSION_CACHE_SIZE):
+        self.max_size = max_size
+        self.bodies = OrderedDict()  # (etag, encoding) -> (compressed body, cpu seconds it took)
+        self.routes = {}
+
+    def get(self, etag, encoding):
+        entry = self.bodies.get((etag, encoding))
+        if entry is not None:
+            self.bodies.move_to_end((etag, encoding))
+        return entry
+
+    def put(self, etag, encoding, body, cpu_seconds):
+        self.bodies[(etag, encoding)] = (body, cpu_seconds)
+        self.bodies.move_to_end((etag, encoding))
+        while len(self.bodies) > self.max_size:
+            self.bodies.popitem(last=False)
+
+    def record(self, route, original_size, compressed_size, cpu_seconds, cached):
+        stats = self.routes.setdefault(route, {
+            "responses": 0, "cache_hits": 0, "bytes_in": 0, "bytes_out": 0,
+            "cpu_seconds": 0.0, "cpu_seconds_saved": 0.0
+        })
+        stats["responses"] += 1
+        stats["bytes_in"] += original_size
+        stats["bytes_out"] += compressed_size
+        if cached:
+            stats["cache_hits"] += 1
+            stats["cpu_seconds_saved"] += cpu_seconds
+        else:
+            stats["cpu_seconds"] += cpu_seconds
+
+    def stats(self):
+        routes = {}
+        for route, stats in self.routes.items():
+            routes[route] = {
+                **stats,
+                "ratio": round(stats["bytes_in"] / stats["bytes_out"], 2) if stats["bytes_out"] else None,
+                "cpu_seconds": round(stats["cpu_seconds"], 4),
+                "cpu_seconds_saved": round(stats["cpu_seconds_saved"], 4)
+            }
+        return {
+            "encodings": sorted(ENCODERS),
+            "cached_bodies": len(self.bodies),
+            "cached_bytes": sum(len(body) for body, _ in self.bodies.values()),
+            "routes": routes
+        }
+
+
+class CompressionMiddleware:
+    """ASGI middleware negotiating brotli/gzip for JSON responses
+
+    Sits outside ConditionalRequestMiddleware, so the ETag it sees identifies the
+    uncompressed content: compressed bodies are cached under (ETag, encoding) and
+    reused until the content changes. The ETag is downgraded to a weak validator on
+    every 200 and 304 sent to a client that negotiated an encoding, so a 304 repeats
+    the validator of the 200 it revalidates and If-None-Match works across encodings.
+    """
+
+    def __init__(self, app, stats: CompressionStats, min_size=COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.stats = stats
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start_message = None
+        body_parts = []
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            headers = MutableHeaders(raw=start_message["headers"])
+            if start_message["status"] in (200, 304):
+                headers.add_vary_header("Accept-Encoding")
+                # Same validator on the 200 and on later 304s for this client, compressed or not
+                etag = headers.get("etag")
+                if encoding is not None and etag and not etag.startswith("W/"):
+                    headers["etag"] = "W/" + etag
+
+            content_type = headers.get("content-type", "")
+            if (encoding is None or start_message["status"] != 200 or len(body) < self.min_size
+                    or "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES)):
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            etag = headers.get("etag")
+            # Weak and strong forms of one validator name the same content
+            version = etag.removeprefix("W/") if etag else None
+            cached = self.stats.get(version, encoding) if version else None
+            if cached is not None:
+                compressed, cpu_seconds = cached
+            else:
+                started = time.thread_time()
+                compressed = ENCODERS[encoding](body)
+                cpu_seconds = time.thread_time() - started
+                if version:
+                    self.stats.put(version, encoding, compressed, cpu_seconds)
+
+            route = scope.get("route")
+            self.stats.record(route.path if route is not None else scope["path"],
+                              len(body), len(compressed), cpu_seconds, cached is not None)
+
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
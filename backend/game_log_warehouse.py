@@ -0,0 +1,470 @@
+# Local columnar warehouse of league-wide game logs
+# LeagueGameLog rows for every player and team are stored as Parquet files partitioned by
+# season (data/warehouse/<kind>/season=<season>/part-*.parquet). Each ingestion run only asks
+# upstream for games on or after the last ingested date, and season totals for players, teams
+# and leaders are aggregated locally instead of calling a per-entity dashboard per request.
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+from nba_api.stats.library.parameters import Season
+
+try:
+    import fcntl
+except ImportError:  # no inter-process lock on Windows: run a single ingesting process there
+    fcntl = None
+
+from lazy_imports import lazy_module
+
+# pandas (and pyarrow) load on the first warehouse read or write, not at app import
+pd = lazy_module("pandas")
+
+WAREHOUSE_PATH = os.getenv(
+    "WAREHOUSE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "warehouse")
+)
+WAREHOUSE_ENABLED = os.getenv("WAREHOUSE_ENABLED", "1") != "0"
+# The season in progress (nba_api derives it from today's date); only this season is live
+CURRENT_SEASON = os.getenv("NBA_CURRENT_SEASON", Season.default)
+# Seasons kept up to date by the scheduled ingestion (comma separated)
+WAREHOUSE_SEASONS = [season.strip() for season in os.getenv("WAREHOUSE_SEASONS", CURRENT_SEASON).split(",") if season.strip()]
+# The current season is only served locally while its last ingestion check is this recent
+WAREHOUSE_MAX_AGE_SECONDS = float(os.getenv("WAREHOUSE_MAX_AGE_SECONDS", str(36 * 3600)))
+WAREHOUSE_INGEST_INTERVAL_SECONDS = float(os.getenv("WAREHOUSE_INGEST_INTERVAL_SECONDS", str(6 * 3600)))
+WAREHOUSE_INGEST_INITIAL_DELAY_SECONDS = float(os.getenv("WAREHOUSE_INGEST_INITIAL_DELAY_SECONDS", "30"))
+# Part files per season before they are compacted into one
+WAREHOUSE_COMPACT_PARTS = int(os.getenv("WAREHOUSE_COMPACT_PARTS", "16"))
+# How often other processes' ingestions are picked up from the manifest
+WAREHOUSE_MANIFEST_CHECK_SECONDS = 30
+
+# kind -> (LeagueGameLog player_or_team_abbreviation, unique row key)
+KINDS = {
+    "player": ("P", ["GAME_ID", "PLAYER_ID"]),
+    "team": ("T", ["GAME_ID", "TEAM_ID"]),
+}
+
+ID_COLUMNS = ["PLAYER_ID", "TEAM_ID"]
+TEXT_COLUMNS = ["SEASON_ID", "PLAYER_NAME", "TEAM_ABBREVIATION", "TEAM_NAME", "GAME_ID", "MATCHUP", "WL"]
+SUM_COLUMNS = [
+    "MIN", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "OREB", "DREB", "REB",
+    "AST", "STL", "BLK", "TOV", "PF", "PTS", "PLUS_MINUS"
+]
+# Counting stats converted for the PerGame / Per48 leader tables (percentages are not)
+LEADER_COUNTING_COLUMNS = ["MIN", "PTS", "REB", "AST", "STL", "BLK", "EFF", "FGM", "FG3M", "FTM"]
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Give upstream rows a stable schema so every part file has identical column types"""
+    frame = frame.drop(columns=["VIDEO_AVAILABLE", "FANTASY_PTS"], errors="ignore").copy()
+    frame["GAME_DATE"] = pd.to_datetime(frame["GAME_DATE"])
+    for column in ID_COLUMNS:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("int64")
+    for column in TEXT_COLUMNS:
+        if column in frame.columns:
+            frame[column] = frame[column].astype(str)
+    for column in SUM_COLUMNS + ["FG_PCT", "FG3_PCT", "FT_PCT"]:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float64")
+    return frame
+
+
+def _ratio(numerator, denominator):
+    return (numerator / denominator.where(denominator > 0)).astype("float64")
+
+
+def _season_totals(logs: pd.DataFrame, key: str, label_columns) -> pd.DataFrame:
+    """Sum a season of game logs per player or team, with shooting percentages and EFF"""
+    ordered = logs.sort_values("GAME_DATE")
+    grouped = ordered.groupby(key, sort=True)
+    totals = grouped[SUM_COLUMNS].sum()
+    totals["GP"] = grouped.size().astype("float64")
+    totals = totals.join(grouped[label_columns].last())
+    totals["FG_PCT"] = _ratio(totals["FGM"], totals["FGA"])
+    totals["FG3_PCT"] = _ratio(totals["FG3M"], totals["FG3A"])
+    totals["FT_PCT"] = _ratio(totals["FTM"], totals["FTA"])
+    # NBA efficiency: PTS + REB + AST + STL + BLK - missed FG - missed FT - TOV
+    totals["EFF"] = (totals["PTS"] + totals["REB"] + totals["AST"] + totals["STL"] + totals["BLK"]
+                     - (totals["FGA"] - totals["FGM"]) - (totals["FTA"] - totals["FTM"]) - totals["TOV"])
+    if "WL" in logs.columns:
+        totals["W"] = grouped["WL"].apply(lambda results: (results == "W").sum()).astype("float64")
+        totals["L"] = totals["GP"] - totals["W"]
+        totals["W_PCT"] = _ratio(totals["W"], totals["GP"])
+    return totals
+
+
+class GameLogWarehouse:
+    """Parquet game-log store with incremental ingestion and cached season aggregates"""
+
+    def __init__(self, path=WAREHOUSE_PATH, max_age=WAREHOUSE_MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age = max_age
+        self._manifest = {}
+        self._manifest_signature = None
+        self._manifest_checked = 0.0
+        self._cache = {}  # (name, kind, season, updated_at) -> DataFrame
+        self._cache_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._task = None
+        self._listeners = []
+        self.ingest_runs = 0
+        self.ingest_failures = 0
+        self.rows_ingested = 0
+        self.last_ingest_seconds = None
+        self._refresh_manifest(force=True)
+
+    # --- storage -----------------------------------------------------------------
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.path, "manifest.json")
+
+    def _refresh_manifest(self, force=False):
+        """Re-read the manifest if another process (e.g. the CLI ingester) changed it"""
+        now = time.monotonic()
+        if not force and now - self._manifest_checked < WAREHOUSE_MANIFEST_CHECK_SECONDS:
+            return
+        self._manifest_checked = now
+        try:
+            stat = os.stat(self._manifest_path)
+        except FileNotFoundError:
+            return
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        if signature != self._manifest_signature:
+            with open(self._manifest_path) as manifest_file:
+                self._manifest = json.load(manifest_file)
+            self._manifest_signature = signature
+
+    @contextmanager
+    def _locked(self):
+        """Hold the warehouse write lock (threads and processes) around a manifest read-modify-write
+
+        The manifest is re-read under the lock, so appends from other workers or the CLI
+        ingester are neither overwritten nor stored twice.
+        """
+        with self._write_lock:
+            os.makedirs(self.path, exist_ok=True)
+            with open(os.path.join(self.path, ".lock"), "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)  # released when the file closes
+                self._refresh_manifest(force=True)
+                yield
+
+    def _write_manifest(self):
+        os.makedirs(self.path, exist_ok=True)
+        temporary_path = self._manifest_path + f".{os.getpid()}.tmp"
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(self._manifest, manifest_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self._manifest_path)
+        stat = os.stat(self._manifest_path)
+        self._manifest_signature = (stat.st_ino, stat.st_mtime_ns)
+
+    def season_info(self, kind, season):
+        self._refresh_manifest()
+        return self._manifest.get(kind, {}).get(season)
+
+    def seasons(self, kind="player"):
+        self._refresh_manifest()
+        return sorted(self._manifest.get(kind, {}))
+
+    def add_listener(self, listener):
+        """listener(kind, season, new_rows, updated_at, previous_updated_at) is called after each
+        append that stored rows; ingest() calls it on the event loop"""
+        self._listeners.append(listener)
+
+    def _notify(self, kind, season, stored):
+        frame, updated_at, previous_updated_at = stored
+        if not frame.empty:
+            for listener in self._listeners:
+                listener(kind, season, frame, updated_at, previous_updated_at)
+        return len(frame)
+
+    def _cached(self, name, kind, season, build):
+        info = self.season_info(kind, season)
+        if info is None:
+            return None
+        key = (name, kind, season, info["updated_at"])
+        with self._cache_lock:
+            value = self._cache.get(key)
+        if value is None:
+            # Built outside the lock (ingestion threads and requests both read); a race only builds twice
+            value = build()
+            with self._cache_lock:
+                # Drop aggregates built from older versions of this season
+                for stale in [k for k in self._cache if k[:3] == (name, kind, season) and k != key]:
+                    del self._cache[stale]
+                self._cache[key] = value
+        return value
+
+    def load(self, kind, season) -> pd.DataFrame:
+        """All stored game-log rows for one kind and season, or None if never ingested"""
+        def read():
+            info = self.season_info(kind, season)
+            season_dir = os.path.join(self.path, kind, f"season={season}")
+            frames = [pd.read_parquet(os.path.join(season_dir, part)) for part in info["parts"]]
+            return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return self._cached("logs", kind, season, read)
+
+    def append(self, kind, season, frame: pd.DataFrame) -> int:
+        """Store rows not already in the warehouse; returns the number of new rows"""
+        return self._notify(kind, season, self._store(kind, season, frame))
+
+    def _store(self, kind, season, frame: pd.DataFrame):
+        """Write new rows under the write lock; returns (new rows, updated_at, previous updated_at)"""
+        frame = _normalize(frame) if not frame.empty else frame
+        with self._locked():
+            return self._store_locked(kind, season, frame)
+
+    def _store_locked(self, kind, season, frame: pd.DataFrame):
+        key_columns = KINDS[kind][1]
+        previous = self._manifest.get(kind, {}).get(season)
+        info = dict(previous or {"parts": [], "rows": 0, "last_game_date": None})
+
+        if not frame.empty and info["rows"]:
+            existing = self.load(kind, season)
+            # Only the overlapping tail (re-fetched from the last ingested date) can repeat
+            overlap = existing[existing["GAME_DATE"] >= frame["GAME_DATE"].min()]
+            seen = pd.MultiIndex.from_frame(overlap[key_columns])
+            frame = frame[~pd.MultiIndex.from_frame(frame[key_columns]).isin(seen)]
+
+        if not frame.empty:
+            season_dir = os.path.join(self.path, kind, f"season={season}")
+            os.makedirs(season_dir, exist_ok=True)
+            part = f"part-{datetime.now().strftime('%Y%m%d%H%M%S%f')}.parquet"
+            temporary_path = os.path.join(season_dir, f".{part}.tmp")
+            frame.to_parquet(temporary_path, index=False)
+            os.replace(temporary_path, os.path.join(season_dir, part))
+            info["parts"] = info["parts"] + [part]
+            info["rows"] += len(frame)
+            last_date = frame["GAME_DATE"].max().strftime("%Y-%m-%d")
+            info["last_game_date"] = max(filter(None, [info["last_game_date"], last_date]))
+
+        # updated_at versions the stored rows (aggregate caches, listeners);
+        # checked_at records the last ingestion, whether or not it found new games
+        now = time.time()
+        if not frame.empty or "updated_at" not in info:
+            info["updated_at"] = now
+        info["checked_at"] = now
+        self._manifest.setdefault(kind, {})[season] = info
+        self._write_manifest()
+
+        if len(info["parts"]) > WAREHOUSE_COMPACT_PARTS:
+            self._compact_locked(kind, season)
+        previous_updated_at = previous["updated_at"] if previous else None
+        return frame, self._manifest[kind][season]["updated_at"], previous_updated_at
+
+    def compact(self, kind, season):
+        """Rewrite a season's part files as a single file"""
+        with self._locked():
+            self._compact_locked(kind, season)
+
+    def _compact_locked(self, kind, season):
+        info = dict(self._manifest[kind][season])
+        logs = self.load(kind, season)
+        season_dir = os.path.join(self.path, kind, f"season={season}")
+        part = f"part-{datetime.now().strftime('%Y%m%d%H%M%S%f')}.parquet"
+        temporary_path = os.path.join(season_dir, f".{part}.tmp")
+        logs.to_parquet(temporary_path, index=False)
+        os.replace(temporary_path, os.path.join(season_dir, part))
+        old_parts, info["parts"] = info["parts"], [part]
+        info["updated_at"] = time.time()
+        self._manifest[kind][season] = info
+        self._write_manifest()
+        for old_part in old_parts:
+            try:
+                os.remove(os.path.join(season_dir, old_part))
+            except FileNotFoundError:
+                pass
+
+    # --- ingestion ---------------------------------------------------------------
+
+    async def ingest(self, fetch_frames, seasons=None):
+        """Pull new player and team game logs for each season through fetch_frames
+
+        fetch_frames(endpoint_cls, use_store=False, **params) is UpstreamClient.fetch_frames,
+        so ingestion shares the upstream rate limit, retries and circuit breaker. The
+        persistent response store is bypassed: the warehouse already keeps these rows.
+        """
+        from nba_api.stats.endpoints import leaguegamelog
+
+        started = time.monotonic()
+        added = {}
+        for season in seasons or WAREHOUSE_SEASONS:
+            for kind, (abbreviation, _) in KINDS.items():
+                info = self.season_info(kind, season)
+                params = dict(season=season, player_or_team_abbreviation=abbreviation,
+                              season_type_all_star="Regular Season")
+                if info and info.get("last_game_date"):
+                    # Inclusive: games on the last date may have been only partly final
+                    params["date_from_nullable"] = datetime.strptime(info["last_game_date"], "%Y-%m-%d").strftime("%m/%d/%Y")
+                frame = (await fetch_frames(leaguegamelog.LeagueGameLog, use_store=False, **params))[0]
+                stored = await asyncio.to_thread(self._store, kind, season, frame)
+                # Listeners run here on the event loop, not in the writer thread
+                added[f"{kind}/{season}"] = self._notify(kind, season, stored)
+        self.ingest_runs += 1
+        self.rows_ingested += sum(added.values())
+        self.last_ingest_seconds = round(time.monotonic() - started, 2)
+        return added
+
+    async def _run_scheduled(self, fetch_frames, interval, initial_delay):
+        await asyncio.sleep(initial_delay)
+        while True:
+            try:
+                added = await self.ingest(fetch_frames)
+                print(f"🗄️ Game-log warehouse ingested {added} in {self.last_ingest_seconds}s")
+            except Exception as e:
+                self.ingest_failures += 1
+                print(f"⚠️ Game-log warehouse ingestion failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, fetch_frames, interval=WAREHOUSE_INGEST_INTERVAL_SECONDS,
+              initial_delay=WAREHOUSE_INGEST_INITIAL_DELAY_SECONDS):
+        if interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run_scheduled(fetch_frames, interval, initial_delay))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # --- queries -----------------------------------------------------------------
+
+    def checked_age(self, kind, season):
+        """Seconds since the season's last ingestion check, or None if never ingested"""
+        info = self.season_info(kind, season)
+        if info is None:
+            return None
+        return time.time() - info.get("checked_at", info["updated_at"])
+
+    def is_servable(self, kind, season) -> bool:
+        """Past seasons are closed; the current one must have been checked recently"""
+        info = self.season_info(kind, season)
+        if info is None or not info["rows"]:
+            return False
+        if season != CURRENT_SEASON:
+            return season < CURRENT_SEASON
+        return self.checked_age(kind, season) < self.max_age
+
+    def current_season(self, kind="player"):
+        """CURRENT_SEASON when the warehouse can serve it, otherwise None"""
+        return CURRENT_SEASON if self.is_servable(kind, CURRENT_SEASON) else None
+
+    def player_totals(self, season):
+        return self._cached("player_totals", "player", season, lambda: _season_totals(
+            self.load("player", season), "PLAYER_ID", ["PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION"]))
+
+    def team_totals(self, season):
+        return self._cached("team_totals", "team", season, lambda: _season_totals(
+            self.load("team", season), "TEAM_ID", ["TEAM_ABBREVIATION", "TEAM_NAME"]))
+
+    def player_season_frame(self, player_id):
+        """Current-season totals for one player shaped like the ByYearPlayerDashboard row, or None"""
+        season = self.current_season("player")
+        if season is None:
+            return None
+        totals = self.player_totals(season)
+        if player_id not in totals.index:
+            return None
+        return totals.loc[[player_id]].reset_index()
+
+    def team_season_frame(self, team_id):
+        """Current-season totals for one team shaped like the TeamDashboardByGeneralSplits row, or None"""
+        season = self.current_season("team")
+        if season is None:
+            return None
+        totals = self.team_totals(season)
+        if team_id not in totals.index:
+            return None
+        return totals.loc[[team_id]].reset_index()
+
+    def leaders_frame(self, season, per_mode):
+        """League leaders table (same columns as LeagueLeaders) built from local logs, or None"""
+        if not self.is_servable("player", season):
+            return None
+
+        def build():
+            totals = self.player_totals(season)
+            frame = pd.DataFrame({
+                "PLAYER": totals["PLAYER_NAME"].to_numpy(),
+                "TEAM": totals["TEAM_ABBREVIATION"].to_numpy(),
+                "PLAYER_ID": totals.index.to_numpy(dtype=np.float64),
+                "TEAM_ID": totals["TEAM_ID"].to_numpy(dtype=np.float64),
+                "GP": totals["GP"].to_numpy(),
+            })
+            for column in LEADER_COUNTING_COLUMNS + ["FG_PCT", "FG3_PCT", "FT_PCT"]:
+                frame[column] = totals[column].to_numpy(dtype=np.float64)
+            if per_mode == "PerGame":
+                frame[LEADER_COUNTING_COLUMNS] = (frame[LEADER_COUNTING_COLUMNS].div(frame["GP"], axis=0)).round(1)
+            elif per_mode == "Per48":
+                minutes = frame["MIN"].where(frame["MIN"] > 0)
+                counting = [column for column in LEADER_COUNTING_COLUMNS if column != "MIN"]
+                frame[counting] = (frame[counting].mul(48.0 / minutes, axis=0)).round(1)
+            frame[["FG_PCT", "FG3_PCT", "FT_PCT"]] = frame[["FG_PCT", "FG3_PCT", "FT_PCT"]].round(3)
+            return frame
+
+        return self._cached(f"leaders_{per_mode}", "player", season, build)
+
+    def stats(self):
+        self._refresh_manifest()
+        seasons = {}
+        for kind, by_season in self._manifest.items():
+            for season, info in by_season.items():
+                seasons[f"{kind}/{season}"] = {
+                    "rows": info["rows"],
+                    "parts": len(info["parts"]),
+                    "last_game_date": info["last_game_date"],
+                    "age_seconds": round(time.time() - info["updated_at"], 1),
+                    "checked_age_seconds": round(self.checked_age(kind, season), 1),
+                    "servable": self.is_servable(kind, season)
+                }
+        return {
+            "path": self.path,
+            "scheduled": self._task is not None and not self._task.done(),
+            "ingest_runs": self.ingest_runs,
+            "ingest_failures": self.ingest_failures,
+            "rows_ingested": self.rows_ingested,
+            "last_ingest_seconds": self.last_ingest_seconds,
+            "seasons": seasons
+        }
+
+
+def open_default_warehouse():
+    """The shared warehouse, or None when WAREHOUSE_ENABLED=0"""
+    if not WAREHOUSE_ENABLED:
+        return None
+    return GameLogWarehouse()
+
+
+def main():
+    import argparse
+
+    from upstream import UpstreamClient
+
+    parser = argparse.ArgumentParser(description="Ingest league game logs into the local warehouse")
+    parser.add_argument("--seasons", nargs="+", default=WAREHOUSE_SEASONS)
+    args = parser.parse_args()
+
+    async def run():
+        client = UpstreamClient()
+        try:
+            return await GameLogWarehouse().ingest(client.fetch_frames, args.seasons)
+        finally:
+            client.shutdown()
+
+    print(f"✅ Ingested new rows: {asyncio.run(run())}")
+
+
+if __name__ == "__main__":
+    main()
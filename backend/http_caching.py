@@ -0,0 +1,185 @@
+# HTTP conditional requests and Cache-Control for the API routes
+# Every GET /api/* response gets a content-hash ETag, a Last-Modified date and a
+# per-route Cache-Control policy. Matching If-None-Match / If-Modified-Since gets a 304.
+
+import hashlib
+import time
+from collections import OrderedDict, namedtuple
+from email.utils import formatdate, parsedate_to_datetime
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from responses import etag_matches
+
+CachePolicy = namedtuple("CachePolicy", ["max_age", "stale_while_revalidate", "public"])
+
+# Per-route policies, matched by path prefix (first match wins)
+CACHE_POLICIES = [
+    ("/api/teams", CachePolicy(86400, 604800, True)),
+    ("/api/nba-teams", CachePolicy(86400, 604800, True)),
+    ("/api/standings", CachePolicy(60, 600, True)),
+    ("/api/league-leaders", CachePolicy(300, 1800, True)),
+    ("/api/team/", CachePolicy(300, 900, True)),
+    ("/api/player/", CachePolicy(300, 900, True)),
+    ("/api/predictions/", CachePolicy(300, 900, True)),
+    ("/api/cache/", CachePolicy(0, 0, False)),
+    ("/api/metrics/", CachePolicy(0, 0, False)),
+]
+DEFAULT_POLICY = CachePolicy(0, 0, False)
+
+# Validators remembered per URL: the current ETag, when that content was first seen
+# (Last-Modified) and when it was last confirmed by running the endpoint
+Validator = namedtuple("Validator", ["etag", "last_modified", "validated_at"])
+
+
+def policy_for(path: str) -> CachePolicy:
+    for prefix, policy in CACHE_POLICIES:
+        if path.startswith(prefix):
+            return policy
+    return DEFAULT_POLICY
+
+
+def cache_control_header(policy: CachePolicy) -> str:
+    if not policy.max_age:
+        return "no-cache"
+    visibility = "public" if policy.public else "private"
+    return f"{visibility}, max-age={policy.max_age}, stale-while-revalidate={policy.stale_while_revalidate}"
+
+
+def not_modified(validator: Validator, if_none_match, if_modified_since) -> bool:
+    """Evaluate request validators; If-None-Match takes precedence over If-Modified-Since"""
+    if if_none_match:
+        return etag_matches(if_none_match, validator.etag)
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(validator.last_modified) <= since
+    return False
+
+
+class ValidatorStore:
+    """Bounded LRU of per-URL validators plus 200/304 counters, shared with the stats endpoint"""
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.validators = OrderedDict()
+        self.responses_200 = 0
+        self.responses_304 = 0
+        self.short_circuits = 0
+
+    def get(self, key):
+        return self.validators.get(key)
+
+    def remember(self, key, etag):
+        now = time.time()
+        previous = self.validators.get(key)
+        last_modified = previous.last_modified if previous is not None and previous.etag == etag else now
+        validator = Validator(etag, last_modified, now)
+        self.validators[key] = validator
+        self.validators.move_to_end(key)
+        while len(self.validators) > self.max_size:
+            self.validators.popitem(last=False)
+        return validator
+
+    def stats(self):
+        return {
+            "tracked_urls": len(self.validators),
+            "responses_200": self.responses_200,
+            "responses_304": self.responses_304,
+            "short_circuits": self.short_circuits
+        }
+
+
+class ConditionalRequestMiddleware:
+    """ASGI middleware adding ETag/Last-Modified/Cache-Control and answering 304s
+
+    Within a route's max-age, a request whose validators match the remembered ETag is
+    answered with 304 without running the endpoint at all. After that the endpoint runs,
+    its body is hashed, and a 304 is still sent if the content did not change.
+    Responses that set their own Cache-Control (e.g. error payloads with no-store) are
+    passed through untouched.
+    """
+
+    def __init__(self, app, store: ValidatorStore):
+        self.app = app
+        self.store = store
+
+    @staticmethod
+    def _validator_headers(validator: Validator, policy: CachePolicy):
+        return [
+            (b"etag", validator.etag.encode("latin-1")),
+            (b"last-modified", formatdate(validator.last_modified, usegmt=True).encode("latin-1")),
+            (b"cache-control", cache_control_header(policy).encode("latin-1")),
+        ]
+
+    async def _send_304(self, send, validator, policy):
+        self.store.responses_304 += 1
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": self._validator_headers(validator, policy),
+        })
+        await send({"type": "http.response.body", "body": b""})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        key = path + "?" + scope.get("query_string", b"").decode("latin-1")
+        policy = policy_for(path)
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        if_modified_since = request_headers.get("if-modified-since")
+
+        # Fresh validator and matching client copy: skip the endpoint and serialization entirely
+        validator = self.store.get(key)
+        if (validator is not None and policy.max_age and (if_none_match or if_modified_since)
+                and time.time() - validator.validated_at < policy.max_age
+                and not_modified(validator, if_none_match, if_modified_since)):
+            self.store.short_circuits += 1
+            await self._send_304(send, validator, policy)
+            return
+
+        start_message = None
+        body_parts = []
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if start_message["status"] != 200 or "cache-control" in headers:
+                # Endpoint-level 304s (pre-serialized routes) still get the route policy
+                if start_message["status"] == 304 and "cache-control" not in headers:
+                    headers["cache-control"] = cache_control_header(policy)
+                    self.store.responses_304 += 1
+                await send(start_message)
+                await send({"type": "http.response.body", "body": b"".join(body_parts)})
+                return
+
+            body = b"".join(body_parts)
+            etag = headers.get("etag") or '"' + hashlib.sha1(body).hexdigest() + '"'
+            current = self.store.remember(key, etag)
+            if not_modified(current, if_none_match, if_modified_since):
+                await self._send_304(send, current, policy)
+                return
+
+            self.store.responses_200 += 1
+            for name, value in self._validator_headers(current, policy):
+                headers[name.decode("latin-1")] = value.decode("latin-1")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,19 @@
+# Deterministic random generators derived from stable keys
+# Each caller gets its own numpy Generator seeded from a key such as ("prediction", player_id),
+# so outputs never depend on global RNG state, request interleaving or worker threads.
+
+import zlib
+
+import numpy as np
+
+
+def _key_entropy(part) -> int:
+    # Python's hash() is salted per process, so strings go through crc32 instead
+    if isinstance(part, (int, np.integer)) and part >= 0:
+        return int(part)
+    return zlib.crc32(str(part).encode("utf-8"))
+
+
+def keyed_rng(*key) -> np.random.Generator:
+    """Independent Generator for a stable key: the same key always yields the same stream"""
+    return np.random.default_rng(np.random.SeedSequence([_key_entropy(part) for part in key]))
@@ -0,0 +1,38 @@
+# Deferred imports for heavy dependencies
+# lazy_module("pandas") returns a stand-in that imports the real module on first attribute
+# access, so `pd.DataFrame` keeps working unchanged while importing the app (every uvicorn
+# worker and every --reload restart) no longer pays for pandas or the ~140 nba_api
+# endpoint modules up front.
+
+import importlib
+import sys
+
+
+class LazyModule:
+    """Module stand-in that imports its target on first attribute access"""
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        module = importlib.import_module(self._name)
+        self._module = module
+        return module
+
+    def __getattr__(self, attribute):
+        module = self._module
+        if module is None:
+            module = self._load()
+        return getattr(module, attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name):
+    """The module itself if already imported, otherwise a stand-in that imports it on first use"""
+    return sys.modules.get(name) or LazyModule(name)
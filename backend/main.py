@@ -1,64 +1,70 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
-import uvicorn
 from datetime import datetime, date
-import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
-import json
-
-# Custom JSON encoder for numpy types
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super(NumpyEncoder, self).default(obj)
-
-def convert_numpy_types(obj):
-    """Convert numpy types to native Python types for JSON serialization"""
-    if isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif pd.isna(obj):
-        return None
-    return obj
-
-# NBA API imports
-from nba_api.stats.endpoints import (
-    leaguegamelog, teamgamelog, playergamelog, 
-    leaguestandings, scoreboard, teamdetails,
-    playerdashboardbyyearoveryear, commonplayerinfo,
-    commonteamroster, teamdashboardbygeneralsplits
-)
-from nba_api.stats.static import teams, players
+from pydantic import BaseModel
+import os
+import re
+import time
+
+# Heavy dependencies are imported on first use (python benchmarks/startup_profile.py shows the cost)
+from lazy_imports import lazy_module
+pd = lazy_module("pandas")
+
+# NBA API endpoints (importing any one of them loads the whole nba_api endpoints package)
+leaguestandings = lazy_module("nba_api.stats.endpoints.leaguestandings")
+playerdashboardbyyearoveryear = lazy_module("nba_api.stats.endpoints.playerdashboardbyyearoveryear")
+commonplayerinfo = lazy_module("nba_api.stats.endpoints.commonplayerinfo")
+commonteamroster = lazy_module("nba_api.stats.endpoints.commonteamroster")
+teamdashboardbygeneralsplits = lazy_module("nba_api.stats.endpoints.teamdashboardbygeneralsplits")
 
-# Import hardcoded team database
+# Import hardcoded team database and the immutable index built from it
 from nba_teams_database import NBA_TEAMS_DATA
+from team_index import TEAM_INDEX
+
+# Vectorized DataFrame-to-JSON serialization and orjson responses
+from serializers import Field, frame_to_records
+from responses import NumpyORJSONResponse, ORJSONRoute
+from http_caching import ConditionalRequestMiddleware, ValidatorStore
+from compression import CompressionMiddleware, CompressionStats
+
+# Upstream fetch layer (runs blocking nba_api calls on a bounded thread pool)
+from upstream import upstream
+
+# Background cache pre-warmer
+from prewarm import CacheWarmer, PREWARM_ENABLED
+
+# Trained player prediction model (built offline by train_player_model.py)
+from player_model import PLAYER_MODEL_PATH, load_player_model
+from model_registry import ModelRegistry
+from keyed_random import keyed_rng
 
-# ML imports
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-import joblib
+# Local Parquet warehouse of league game logs (season totals without per-entity upstream calls)
+from game_log_warehouse import CURRENT_SEASON, open_default_warehouse
+from standings_engine import StandingsEngine
+
+# Type-ahead player name index over the static player registry
+from player_search import PlayerSearchIndex, SEARCH_MAX_LIMIT
+from player_registry import PlayerRegistry
 
 app = FastAPI(
     title="NBA Analytics & Predictions API",
     description="Interactive NBA Web App with ML-powered predictions",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=NumpyORJSONResponse
 )
+# Render endpoint results with orjson directly instead of jsonable_encoder + json.dumps
+app.router.route_class = ORJSONRoute
+
+# Conditional requests (ETag / Last-Modified / 304) and per-route Cache-Control.
+# Added before CORS so CORS stays the outermost layer and also decorates 304s.
+http_validators = ValidatorStore()
+app.add_middleware(ConditionalRequestMiddleware, store=http_validators)
+
+# gzip/brotli negotiation outside the ETag layer, so compressed bodies are cached per ETag
+compression_stats = CompressionStats()
+app.add_middleware(CompressionMiddleware, stats=compression_stats)
 
 # CORS middleware for React frontend
 app.add_middleware(
@@ -67,64 +73,199 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Data-Age"],
 )
 
-# Global variables for caching
-teams_cache = None
-players_cache = None
-ml_models = {}
+# Static registries: teams live in TEAM_INDEX, players in compact columns built at startup
+player_registry = None
+player_search_index = None
+# Models are memory-mapped from their artifacts and hot-swapped when a new version is saved
+ml_models = ModelRegistry()
+ml_models.register("player_stats", PLAYER_MODEL_PATH, load_player_model)
+# None when WAREHOUSE_ENABLED=0; every lookup then goes upstream as before
+warehouse = open_default_warehouse()
+# Standings derived from the warehouse's team results, updated as new games are ingested
+standings_engine = StandingsEngine()
+if warehouse is not None:
+    warehouse.add_listener(standings_engine.on_ingest)
 
 # Enhanced caching system
-from functools import lru_cache
 from datetime import datetime, timedelta
 import asyncio
+from cache import TTLCache, StaleWhileRevalidateCache, Fetched, make_cache_key
+
+# Cache instances (per-route TTLs, bounded with LRU eviction)
+team_cache = TTLCache(ttl_seconds=600, max_size=128)  # 10 minutes for team data
+player_cache = TTLCache(ttl_seconds=900, max_size=2048)  # 15 minutes for player data
+roster_cache = TTLCache(ttl_seconds=1800, max_size=64)  # 30 minutes for roster data
+
+# League-wide payloads are served stale-while-revalidate: past the soft TTL the last good
+# payload is returned immediately while a background refresh runs, until the hard TTL
+standings_swr = StaleWhileRevalidateCache(
+    soft_ttl=int(os.getenv("STANDINGS_SOFT_TTL", "300")),
+    hard_ttl=int(os.getenv("STANDINGS_HARD_TTL", str(24 * 3600)))
+)
+leaders_swr = StaleWhileRevalidateCache(
+    soft_ttl=int(os.getenv("LEADERS_SOFT_TTL", "900")),
+    hard_ttl=int(os.getenv("LEADERS_HARD_TTL", str(24 * 3600)))
+)
+
+# Team payloads with per-player stats are heavier to rebuild, so keep them a little longer
+TEAM_WITH_PLAYER_STATS_TTL = 1200
 
-# In-memory cache with TTL
-class TTLCache:
-    def __init__(self, ttl_seconds=300):  # 5 minutes default
-        self.cache = {}
-        self.ttl = ttl_seconds
+def mark_uncacheable(response: Optional[Response]):
+    """Tell HTTP caches not to store a fallback or partial payload"""
+    if response is not None:
+        response.headers["Cache-Control"] = "no-store"
+
+def set_data_age(response: Optional[Response], age: float):
+    """Report how old the served data is in a header, so the body (and its ETag) stays stable"""
+    if response is not None:
+        response.headers["X-Data-Age"] = str(int(age))
+
+async def fetch_team_roster(team_id: int):
+    """Fetch the CommonTeamRoster frame for a team, cached per team"""
+    key = make_cache_key("roster", team_id=team_id)
+    roster_df = roster_cache.get(key)
+    if roster_df is None:
+        roster_df = (await upstream.fetch_frames(commonteamroster.CommonTeamRoster, team_id=team_id))[0]
+        roster_cache.set(key, roster_df)
+    return roster_df
+
+async def fetch_team_season_stats(team_id: int):
+    """Season totals row for a team: local warehouse first, TeamDashboardByGeneralSplits otherwise"""
+    if warehouse is not None:
+        # Parquet reads and groupbys run off the event loop
+        local_stats = await asyncio.to_thread(warehouse.team_season_frame, team_id)
+        if local_stats is not None:
+            return local_stats
+    return (await upstream.fetch_frames(
+        teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits, team_id=team_id
+    ))[0]
+
+async def fetch_player_season_stats(player_id: int):
+    """Fetch the ByYearPlayerDashboard frame for a player, cached per player
+
+    Served from the local game-log warehouse when it holds a fresh current season.
+    """
+    if warehouse is not None:
+        local_stats = await asyncio.to_thread(warehouse.player_season_frame, player_id)
+        if local_stats is not None:
+            return local_stats
+    key = make_cache_key("player_dashboard", player_id=player_id)
+    season_stats = player_cache.get(key)
+    if season_stats is None:
+        season_stats = (await upstream.fetch_frames(
+            playerdashboardbyyearoveryear.PlayerDashboardByYearOverYear,
+            player_id=player_id
+        ))[1]  # ByYearPlayerDashboard
+        player_cache.set(key, season_stats)
+    return season_stats
+
+# Per-player stat fan-out limits for /api/team/{team_id}?include_player_stats=true
+PLAYER_STATS_CONCURRENCY = int(os.getenv("PLAYER_STATS_CONCURRENCY", "6"))
+PLAYER_STATS_DEADLINE_SECONDS = float(os.getenv("PLAYER_STATS_DEADLINE_SECONDS", "12"))
+
+def empty_player_stats():
+    return {"games": 0, "ppg": 0.0, "rpg": 0.0, "apg": 0.0, "fg_pct": 0.0, "three_pt_pct": 0.0}
+
+def summarize_player_season(season_stats):
+    """Build the per-game stats block for a roster entry from a ByYearPlayerDashboard frame"""
+    if season_stats.empty:
+        return empty_player_stats()
+    current_season = season_stats.iloc[0]
+    return {
+        "games": int(current_season['GP']) if pd.notna(current_season['GP']) else 0,
+        "ppg": round(float(current_season['PTS']) / max(int(current_season['GP']), 1), 1) if pd.notna(current_season['PTS']) and pd.notna(current_season['GP']) else 0.0,
+        "rpg": round(float(current_season['REB']) / max(int(current_season['GP']), 1), 1) if pd.notna(current_season['REB']) and pd.notna(current_season['GP']) else 0.0,
+        "apg": round(float(current_season['AST']) / max(int(current_season['GP']), 1), 1) if pd.notna(current_season['AST']) and pd.notna(current_season['GP']) else 0.0,
+        "fg_pct": round(float(current_season['FG_PCT']), 3) if pd.notna(current_season['FG_PCT']) else 0.0,
+        "three_pt_pct": round(float(current_season['FG3_PCT']), 3) if pd.notna(current_season['FG3_PCT']) else 0.0
+    }
+
+async def fetch_roster_player_stats(roster, concurrency=None, deadline=None):
+    """Fetch season stats for every roster entry concurrently under a cap and an overall deadline
+
+    Each entry gets a "stats" block and a "stats_status" of ok, no_data, error or timeout.
+    Fetches still running at the deadline are left to finish in the background so their
+    results land in player_cache for the next request.
+    """
+    concurrency = concurrency or PLAYER_STATS_CONCURRENCY
+    deadline = deadline or PLAYER_STATS_DEADLINE_SECONDS
+    semaphore = asyncio.Semaphore(concurrency)
     
-    def set(self, key, value):
-        self.cache[key] = {
-            'value': value,
-            'timestamp': datetime.now()
-        }
+    async def fetch_one(player_id):
+        async with semaphore:
+            return await fetch_player_season_stats(player_id)
     
-    def get(self, key):
-        if key in self.cache:
-            entry = self.cache[key]
-            if datetime.now() - entry['timestamp'] < timedelta(seconds=self.ttl):
-                return entry['value']
-            else:
-                del self.cache[key]
-        return None
+    tasks = {
+        asyncio.ensure_future(fetch_one(player_data["player_id"])): player_data
+        for player_data in roster if player_data["player_id"]
+    }
+    pending = set()
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
     
-    def clear_expired(self):
-        current_time = datetime.now()
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if current_time - entry['timestamp'] >= timedelta(seconds=self.ttl)
-        ]
-        for key in expired_keys:
-            del self.cache[key]
-
-# Cache instances
-team_cache = TTLCache(ttl_seconds=600)  # 10 minutes for team data
-player_cache = TTLCache(ttl_seconds=900)  # 15 minutes for player data
-roster_cache = TTLCache(ttl_seconds=1800)  # 30 minutes for roster data
+    summary = {"requested": len(roster), "ok": 0, "no_data": 0, "error": 0, "timeout": 0}
+    # Entries without a player ID cannot be looked up but keep the same shape
+    for player_data in roster:
+        if not player_data["player_id"]:
+            player_data["stats"] = empty_player_stats()
+            player_data["stats_status"] = "no_data"
+            summary["no_data"] += 1
+    for task, player_data in tasks.items():
+        if task in pending:
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            player_data["stats"] = empty_player_stats()
+            player_data["stats_status"] = "timeout"
+        elif task.exception() is not None:
+            print(f"❌ Could not fetch stats for {player_data['name']} ({player_data['player_id']}): {task.exception()}")
+            player_data["stats"] = empty_player_stats()
+            player_data["stats_status"] = "error"
+        else:
+            season_stats = task.result()
+            player_data["stats"] = summarize_player_season(season_stats)
+            player_data["stats_status"] = "no_data" if season_stats.empty else "ok"
+        summary[player_data["stats_status"]] += 1
+    
+    summary["complete"] = summary["error"] == 0 and summary["timeout"] == 0
+    return summary
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize data and models on startup"""
-    global teams_cache, players_cache
+    global player_registry, player_search_index
+    
+    # Player registry as columns (no per-player dicts) and its search index
+    player_registry = PlayerRegistry.from_static()
+    player_search_index = PlayerSearchIndex(player_registry)
     
-    # Cache teams and players data
-    teams_cache = teams.get_teams()
-    players_cache = players.get_players()
+    # Load the trained prediction models once (predictions never call upstream) and
+    # watch their artifacts for new versions
+    ml_models.load_all(force=True)
+    if ml_models.get("player_stats") is None:
+        print("⚠️ No trained player model; predictions use the heuristic fallback")
+    ml_models.start_watching()
+    
+    # Incrementally ingest new game logs into the local warehouse
+    if warehouse is not None:
+        warehouse.start(upstream.fetch_frames)
+    
+    # Keep the known hot working set warm in the background
+    if PREWARM_ENABLED:
+        cache_warmer.start()
     
     print("✅ NBA Analytics API Started Successfully!")
-    print(f"📊 Loaded {len(teams_cache)} teams and {len(players_cache)} players")
+    print(f"📊 Loaded {len(TEAM_INDEX.ids)} teams and {len(player_registry)} players")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work and release the upstream worker threads"""
+    await cache_warmer.stop()
+    await ml_models.stop_watching()
+    if warehouse is not None:
+        await warehouse.stop()
+    upstream.shutdown()
 
 @app.get("/")
 async def root():
@@ -176,30 +317,9 @@ async def root():
     }
 
 @app.get("/api/teams")
-async def get_all_teams():
-    """Get all NBA teams using hardcoded team names"""
-    try:
-        # Use hardcoded team data to ensure correct team names
-        teams_list = []
-        for team_id, team_data in NBA_TEAMS_DATA.items():
-            basic_info = team_data["basic_info"]
-            teams_list.append({
-                "id": team_id,
-                "full_name": basic_info["full_name"],
-                "abbreviation": basic_info["abbreviation"], 
-                "city": basic_info["city"],
-                "nickname": basic_info["nickname"]
-            })
-        
-        # Sort by full name for consistency
-        teams_list.sort(key=lambda x: x["full_name"])
-        
-        return {
-            "teams": teams_list,
-            "count": len(teams_list)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_all_teams(request: Request = None):
+    """Get all NBA teams using hardcoded team names (pre-serialized at import, ETag aware)"""
+    return TEAM_INDEX.teams_response.response(request)
 
 # SUSPENDED: Live games API endpoint
 # @app.get("/api/live-games")
@@ -212,134 +332,260 @@ async def get_all_teams():
 #         "note": "Live games API suspended"
 #     }
 
+# Output field declarations for whole-frame serialization
+def standings_team_names(df):
+    return [f"{city} {nickname}" for city, nickname in zip(df['TeamCity'].tolist(), df['TeamName'].tolist())]
+
+def standings_abbreviations(df):
+    team_dict = TEAM_INDEX.static_abbreviations
+    return [
+        team_dict.get(int(team_id), str(nickname)[:3].upper())
+        for team_id, nickname in zip(df['TeamID'].tolist(), df['TeamName'].tolist())
+    ]
+
+STANDINGS_FIELDS = [
+    Field("team_id", "TeamID", "int"),
+    Field("team_name", standings_team_names),
+    Field("abbreviation", standings_abbreviations),
+    Field("city", "TeamCity"),
+    Field("nickname", "TeamName"),
+    Field("wins", "WINS", "int"),
+    Field("losses", "LOSSES", "int"),
+    Field("win_pct", "WinPCT", "float", round=3),
+    # Missing or zero ranks sort last
+    Field("conf_rank", "PlayoffRank", "int", default=99, na_values=(0,)),
+    Field("division_rank", "DivisionRank", "int", default=99, na_values=(0,)),
+    Field("conference", "Conference"),
+    Field("games_behind", "ConferenceGamesBack", "float", default=0.0),
+    Field("last_10", "L10", strip=True, default="N/A"),
+    Field("streak", "strCurrentStreak", strip=True, default="N/A"),
+]
+
+LEADER_FIELDS = [
+    Field("player_id", "PLAYER_ID", "int"),
+    Field("rank", "RANK", "int"),
+    Field("name", "PLAYER"),
+    Field("team_id", "TEAM_ID", "int"),
+    Field("team", "TEAM"),
+    Field("games_played", "GP", "int"),
+    Field("minutes", "MIN", "float"),
+    Field("points", "PTS", "float"),
+    Field("rebounds", "REB", "float"),
+    Field("assists", "AST", "float"),
+    Field("steals", "STL", "float"),
+    Field("blocks", "BLK", "float"),
+    Field("field_goal_pct", "FG_PCT", "float"),
+    Field("three_point_pct", "FG3_PCT", "float", default=0.0),
+    Field("free_throw_pct", "FT_PCT", "float"),
+    Field("efficiency", "EFF", "float"),
+]
+
+ROSTER_FIELDS = [
+    Field("player_id", "PLAYER_ID", "int"),
+    Field("name", "PLAYER", default="N/A"),
+    Field("jersey_number", "NUM", default="N/A"),
+    Field("position", "POSITION", default="N/A"),
+    Field("height", "HEIGHT", default="N/A"),
+    Field("weight", "WEIGHT", default="N/A"),
+    Field("birth_date", "BIRTH_DATE", default="N/A"),
+    Field("age", "AGE", "int", default=0),
+    Field("experience", "EXP", default="R"),
+    Field("school", "SCHOOL", default="N/A"),
+]
+
+# Both standings sources (local game results and LeagueStandings) serve this one season
+STANDINGS_SEASON = CURRENT_SEASON
+
+async def load_standings_payload():
+    """Build the standings payload from the NBA API (raises if upstream fails)"""
+    # Get standings from NBA API; stored copies older than the soft TTL are refetched
+    standings_frames, fetched_at = await upstream.fetch_frames_timed(
+        leaguestandings.LeagueStandings, max_age=standings_swr.soft_ttl, season=STANDINGS_SEASON
+    )
+    standings_df = standings_frames[0]
+    
+    # Sort by conference and then by wins (descending)
+    standings_df = standings_df.sort_values(['Conference', 'WINS'], ascending=[True, False], kind='stable')
+    
+    # Process standings data (whole-frame conversion to native Python types)
+    standings = frame_to_records(standings_df, STANDINGS_FIELDS)
+    
+    return Fetched({"standings": standings, "season": STANDINGS_SEASON, "source": "nba_api"}, fetched_at)
+
+async def local_standings_payload(require_fresh: bool = True, response: Response = None):
+    """Standings computed from locally ingested game results, or None if there are none to serve"""
+    if warehouse is None or not await asyncio.to_thread(standings_engine.sync, warehouse, STANDINGS_SEASON):
+        return None
+    season = standings_engine.season
+    fresh = warehouse.is_servable("team", season)
+    if require_fresh and not fresh:
+        return None
+    set_data_age(response, warehouse.checked_age("team", season))
+    return {
+        "standings": standings_engine.standings(),
+        "season": season,
+        "source": "local",
+        "stale": not fresh
+    }
+
 @app.get("/api/standings")
-async def get_league_standings():
-    """Get current NBA standings with real NBA API data"""
+async def get_league_standings(response: Response = None):
+    """Get current NBA standings: local game results first, NBA API (stale-while-revalidate) otherwise"""
+    local_payload = await local_standings_payload(response=response)
+    if local_payload is not None:
+        return local_payload
+    
     try:
-        # Get standings from NBA API
-        standings_data = leaguestandings.LeagueStandings()
-        standings_df = standings_data.get_data_frames()[0]
-        
-        # Get team info from NBA API static data
-        nba_teams = teams.get_teams()
-        team_dict = {team['id']: team for team in nba_teams}
-        
-        # Process standings data
-        standings = []
-        for _, team in standings_df.iterrows():
-            team_id = int(team['TeamID'])
-            team_info = team_dict.get(team_id, {})
-            
-            # Get team city and name from NBA API
-            city = team['TeamCity']
-            nickname = team['TeamName']
-            full_name = f"{city} {nickname}"
-            
-            # Calculate games behind leader for each conference
-            conference = team['Conference']
-            games_behind = float(team.get('ConferenceGamesBack', 0)) if team.get('ConferenceGamesBack') is not None else 0.0
-            
-            standings.append({
-                "team_id": team_id,
-                "team_name": full_name,
-                "abbreviation": team_info.get('abbreviation', nickname[:3].upper()),
-                "city": city,
-                "nickname": nickname,
-                "wins": int(team['WINS']),
-                "losses": int(team['LOSSES']),
-                "win_pct": round(float(team['WinPCT']), 3),
-                "conf_rank": int(team['PlayoffRank']) if team['PlayoffRank'] else 99,
-                "division_rank": int(team['DivisionRank']) if team['DivisionRank'] else 99,
-                "conference": conference,
-                "games_behind": games_behind,
-                "last_10": team.get('L10', 'N/A').strip(),
-                "streak": team.get('strCurrentStreak', 'N/A').strip()
-            })
-        
-        # Sort by conference and then by wins (descending)
-        standings.sort(key=lambda x: (x['conference'], -x['wins']))
-        
-        # Convert numpy types to native Python types
-        standings = convert_numpy_types(standings)
-        
-        return {"standings": standings}
+        payload, age, stale = await standings_swr.get(("standings",), load_standings_payload)
+        set_data_age(response, age)
+        return {**payload, "stale": stale}
         
     except Exception as e:
         print(f"Error fetching standings from NBA API: {e}")
+        # Outdated local standings beat an empty table
+        local_payload = await local_standings_payload(require_fresh=False, response=response)
+        if local_payload is not None:
+            return local_payload
+        mark_uncacheable(response)
         # If NBA API fails, return a message explaining the issue
         return {
             "standings": [],
+            "season": STANDINGS_SEASON,
             "error": "Unable to fetch current standings from NBA API",
             "message": "NBA API may be temporarily unavailable or rate limited. Please try again later.",
             "note": "This endpoint now uses only real NBA API data - no mock data fallback"
         }
 
+# Valid league leader categories
+LEADER_CATEGORIES = [
+    'PTS', 'REB', 'AST', 'STL', 'BLK', 'FG_PCT', 'FG3_PCT', 
+    'FT_PCT', 'MIN', 'FGM', 'FG3M', 'EFF'
+]
+LEADER_PER_MODES = ['Totals', 'PerGame', 'Per48']
+LEADERS_SEASON = CURRENT_SEASON
+# Seasons look like "2024-25"; anything else would grow the SWR cache and the store without bound
+SEASON_PATTERN = re.compile(r"^(\d{4})-(\d{2})$")
+FIRST_NBA_SEASON = '1946-47'
+LEADERS_MAX_LIMIT = 100
+
+# Minimum season makes to qualify for percentage leaderboards (NBA qualification rules),
+# prorated by games played so far in the season
+LEADER_QUALIFIERS = {'FG_PCT': ('FGM', 300), 'FG3_PCT': ('FG3M', 82), 'FT_PCT': ('FTM', 125)}
+SEASON_GAMES = 82
+
+LEADER_TEXT_COLUMNS = ['PLAYER', 'TEAM']
+LEADER_NUMERIC_COLUMNS = [
+    'PLAYER_ID', 'TEAM_ID', 'GP', 'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK',
+    'FG_PCT', 'FG3_PCT', 'FT_PCT', 'EFF', 'FGM', 'FG3M', 'FTM'
+]
+
+async def load_league_leaders_frame(season: str, per_mode: str):
+    """Fetch the full league leaders table once; every category is ranked from this frame"""
+    # Aggregated from local game logs when the warehouse covers the season
+    if warehouse is not None:
+        local_frame = await asyncio.to_thread(warehouse.leaders_frame, season, per_mode)
+        if local_frame is not None:
+            return Fetched(local_frame, time.time() - warehouse.checked_age("player", season))
+    
+    # Import the league leaders endpoint
+    from nba_api.stats.endpoints import leagueleaders
+    
+    # The table holds every stat column for every player, whatever category it is sorted by
+    leaders_frames, fetched_at = await upstream.fetch_frames_timed(
+        leagueleaders.LeagueLeaders,
+        max_age=leaders_swr.soft_ttl,
+        stat_category_abbreviation='PTS',
+        season=season,
+        season_type_all_star='Regular Season',
+        per_mode48=per_mode
+    )
+    df = leaders_frames[0]
+    
+    # Keep a slim columnar copy with float64 stat columns for fast vectorized ranking
+    frame = df[[col for col in LEADER_TEXT_COLUMNS if col in df.columns]].copy()
+    for col in LEADER_NUMERIC_COLUMNS:
+        frame[col] = pd.to_numeric(df[col], errors='coerce').astype('float64') if col in df.columns else np.nan
+    return Fetched(frame.reset_index(drop=True), fetched_at)
+
+def season_makes(frame, column: str, per_mode: str):
+    """Season-total makes for a qualifier column, whatever per_mode the frame is in"""
+    values = frame[column].to_numpy()
+    if per_mode == 'PerGame':
+        return values * frame['GP'].to_numpy()
+    if per_mode == 'Per48':
+        # MIN stays a season total in Per48 tables
+        return values * frame['MIN'].to_numpy() / 48.0
+    return values
+
+def rank_league_leaders(frame, category: str, limit: int = 10, offset: int = 0, per_mode: str = 'Totals'):
+    """Rank the leaders frame by one category and return (page of rows with rank, qualified count)"""
+    qualifier = LEADER_QUALIFIERS.get(category)
+    if qualifier and len(frame):
+        column, minimum = qualifier
+        # Team games played so far, approximated by the most games any player has
+        games_played = min(np.nan_to_num(frame['GP'].max()), SEASON_GAMES)
+        prorated = minimum * games_played / SEASON_GAMES
+        frame = frame[np.nan_to_num(season_makes(frame, column, per_mode)) >= prorated]
+    
+    values = frame[category].to_numpy()
+    order = np.argsort(-np.nan_to_num(values, nan=-np.inf), kind='stable')
+    page = frame.iloc[order[offset:offset + limit]]
+    
+    # Competition ranking ("1, 2, 2, 4"): rank = number of players strictly ahead + 1
+    sorted_desc = np.sort(np.nan_to_num(values, nan=-np.inf))[::-1]
+    page_values = np.nan_to_num(page[category].to_numpy(), nan=-np.inf)
+    ranks = np.searchsorted(-sorted_desc, -page_values, side='left') + 1
+    return page.assign(RANK=ranks), len(frame)
+
+def is_known_season(season: str) -> bool:
+    """True for a well-formed season between the first NBA season and the current one"""
+    match = SEASON_PATTERN.match(season)
+    if match is None or (int(match.group(1)) + 1) % 100 != int(match.group(2)):
+        return False
+    return FIRST_NBA_SEASON <= season <= CURRENT_SEASON
+
 @app.get("/api/league-leaders")
-async def get_league_leaders(category: str = "PTS"):
-    """Get NBA league leaders for different statistical categories"""
+async def get_league_leaders(category: str = "PTS", limit: int = 10, offset: int = 0,
+                             season: str = LEADERS_SEASON, per_mode: str = "Totals", response: Response = None):
+    """Get NBA league leaders for any statistical category (one cached table serves every category)"""
+    if not is_known_season(season):
+        raise HTTPException(status_code=400, detail=f"season must look like 2024-25 and be no later than {CURRENT_SEASON}")
+    
     try:
-        # Import the league leaders endpoint
-        from nba_api.stats.endpoints import leagueleaders
-        
-        # Validate category parameter
-        valid_categories = [
-            'PTS', 'REB', 'AST', 'STL', 'BLK', 'FG_PCT', 'FG3_PCT', 
-            'FT_PCT', 'MIN', 'FGM', 'FG3M', 'EFF'
-        ]
-        
-        if category not in valid_categories:
+        # Validate parameters
+        if category not in LEADER_CATEGORIES:
             category = 'PTS'  # Default to points if invalid category
+        if per_mode not in LEADER_PER_MODES:
+            per_mode = 'Totals'
+        limit = min(max(limit, 1), LEADERS_MAX_LIMIT)
+        offset = max(offset, 0)
         
-        # Get league leaders data from NBA API
-        leaders_data = leagueleaders.LeagueLeaders(
-            stat_category_abbreviation=category,
-            season='2024-25',
-            season_type_all_star='Regular Season',
-            per_mode48='Totals'
+        frame, age, stale = await leaders_swr.get(
+            ("league_leaders", season, per_mode), lambda: load_league_leaders_frame(season, per_mode)
         )
-        
-        # Get the dataframe
-        df = leaders_data.get_data_frames()[0]
-        
-        # Take top 10 players
-        top_players = df.head(10)
+        set_data_age(response, age)
+        page, qualified_players = rank_league_leaders(frame, category, limit, offset, per_mode)
         
         # Format the data for frontend consumption
-        leaders_list = []
-        for _, player in top_players.iterrows():
-            player_data = {
-                "player_id": int(player['PLAYER_ID']),
-                "rank": int(player['RANK']),
-                "name": player['PLAYER'],
-                "team_id": int(player['TEAM_ID']),
-                "team": player['TEAM'],
-                "games_played": int(player['GP']),
-                "minutes": float(player['MIN']),
-                "points": float(player['PTS']),
-                "rebounds": float(player['REB']),
-                "assists": float(player['AST']),
-                "steals": float(player['STL']),
-                "blocks": float(player['BLK']),
-                "field_goal_pct": float(player['FG_PCT']),
-                "three_point_pct": float(player['FG3_PCT']) if player['FG3_PCT'] else 0.0,
-                "free_throw_pct": float(player['FT_PCT']),
-                "efficiency": float(player['EFF']),
-                "category_value": float(player[category])  # The specific stat being ranked by
-            }
-            leaders_list.append(player_data)
-        
-        # Convert numpy types to native Python types
-        leaders_list = convert_numpy_types(leaders_list)
+        leaders_list = frame_to_records(page, LEADER_FIELDS + [
+            Field("category_value", category, "float")  # The specific stat being ranked by
+        ])
         
         return {
             "category": category,
             "leaders": leaders_list,
-            "total_players": len(df),
-            "season": "2024-25"
+            "total_players": len(frame),
+            "qualified_players": qualified_players,
+            "limit": limit,
+            "offset": offset,
+            "per_mode": per_mode,
+            "season": season,
+            "stale": stale
         }
         
     except Exception as e:
         print(f"Error fetching league leaders from NBA API: {e}")
+        mark_uncacheable(response)
         # Return error message if NBA API fails
         return {
             "category": category,
@@ -349,8 +595,134 @@ async def get_league_leaders(category: str = "PTS"):
             "note": "This endpoint uses real NBA API data only"
         }
 
+def team_details_complete(team_data) -> bool:
+    """True when no upstream part of the team payload fell back to a placeholder"""
+    stats_complete = team_data.get("player_stats_status", {}).get("complete", True)
+    return "note" not in team_data and "roster_note" not in team_data and stats_complete
+
+async def build_team_details(team_id: int, include_player_stats: bool = False, request: Request = None):
+    """Build the team payload: hardcoded names plus NBA API stats and roster (None if the client disconnects)"""
+    print(f"✅ Found team {team_id} in database, processing...")
+    team_info = NBA_TEAMS_DATA[team_id]["basic_info"]
+    
+    # Initialize team data with hardcoded basic info
+    team_data = {
+        "basic_info": {
+            "id": team_id,
+            "full_name": team_info['full_name'],
+            "abbreviation": team_info['abbreviation'],
+            "city": team_info['city'],
+            "nickname": team_info['nickname']
+        },
+        "team_id": team_id
+    }
+    
+    # Try to add real team stats from NBA API
+    try:
+        # Check if client disconnected before expensive API call
+        if request and await request.is_disconnected():
+            print(f"🔌 Client disconnected during team stats fetch for team {team_id}")
+            return
+            
+        team_stats_df = await fetch_team_season_stats(team_id)
+        
+        if not team_stats_df.empty:
+            team_stats = team_stats_df.iloc[0]
+            games_played = int(team_stats['GP']) if pd.notna(team_stats['GP']) else 0
+            
+            if games_played:  # Only proceed if we have real data
+                enhanced_stats = {
+                    "games_played": games_played,
+                    "wins": int(team_stats['W']) if pd.notna(team_stats['W']) else None,
+                    "losses": int(team_stats['L']) if pd.notna(team_stats['L']) else None,
+                    "win_pct": round(float(team_stats['W_PCT']), 3) if pd.notna(team_stats['W_PCT']) else None,
+                    
+                    # Offensive Stats (Per Game)
+                    "offensive_stats": {
+                        "avg_points": round(float(team_stats['PTS']) / games_played, 1) if pd.notna(team_stats['PTS']) else None,
+                        "fg_made": round(float(team_stats['FGM']) / games_played, 1) if pd.notna(team_stats['FGM']) else None,
+                        "fg_attempted": round(float(team_stats['FGA']) / games_played, 1) if pd.notna(team_stats['FGA']) else None,
+                        "fg_pct": round(float(team_stats['FG_PCT']), 3) if pd.notna(team_stats['FG_PCT']) else None,
+                        "three_pt_made": round(float(team_stats['FG3M']) / games_played, 1) if pd.notna(team_stats['FG3M']) else None,
+                        "three_pt_attempted": round(float(team_stats['FG3A']) / games_played, 1) if pd.notna(team_stats['FG3A']) else None,
+                        "three_pt_pct": round(float(team_stats['FG3_PCT']), 3) if pd.notna(team_stats['FG3_PCT']) else None,
+                        "free_throws_made": round(float(team_stats['FTM']) / games_played, 1) if pd.notna(team_stats['FTM']) else None,
+                        "free_throws_attempted": round(float(team_stats['FTA']) / games_played, 1) if pd.notna(team_stats['FTA']) else None,
+                        "free_throw_pct": round(float(team_stats['FT_PCT']), 3) if pd.notna(team_stats['FT_PCT']) else None,
+                        "assists": round(float(team_stats['AST']) / games_played, 1) if pd.notna(team_stats['AST']) else None,
+                        "turnovers": round(float(team_stats['TOV']) / games_played, 1) if pd.notna(team_stats['TOV']) else None,
+                        "offensive_rebounds": round(float(team_stats['OREB']) / games_played, 1) if pd.notna(team_stats['OREB']) else None
+                    },
+                    
+                    # Defensive Stats (Per Game)
+                    "defensive_stats": {
+                        "defensive_rebounds": round(float(team_stats['DREB']) / games_played, 1) if pd.notna(team_stats['DREB']) else None,
+                        "total_rebounds": round(float(team_stats['REB']) / games_played, 1) if pd.notna(team_stats['REB']) else None,
+                        "steals": round(float(team_stats['STL']) / games_played, 1) if pd.notna(team_stats['STL']) else None,
+                        "blocks": round(float(team_stats['BLK']) / games_played, 1) if pd.notna(team_stats['BLK']) else None,
+                        "personal_fouls": round(float(team_stats['PF']) / games_played, 1) if pd.notna(team_stats['PF']) else None
+                    },
+                    
+                    # Advanced Stats
+                    "advanced_stats": {
+                        "plus_minus": round(float(team_stats['PLUS_MINUS']), 1) if pd.notna(team_stats['PLUS_MINUS']) else None,
+                        "true_shooting_pct": round(
+                            float(team_stats['PTS']) / (2 * (float(team_stats['FGA']) + 0.44 * float(team_stats['FTA']))), 3
+                        ) if pd.notna(team_stats['PTS']) and pd.notna(team_stats['FGA']) and pd.notna(team_stats['FTA']) else None,
+                        "effective_fg_pct": round(
+                            (float(team_stats['FGM']) + 0.5 * float(team_stats['FG3M'])) / float(team_stats['FGA']), 3
+                        ) if pd.notna(team_stats['FGM']) and pd.notna(team_stats['FG3M']) and pd.notna(team_stats['FGA']) else None,
+                        "assist_to_turnover_ratio": round(
+                            float(team_stats['AST']) / float(team_stats['TOV']), 2
+                        ) if pd.notna(team_stats['AST']) and pd.notna(team_stats['TOV']) and float(team_stats['TOV']) > 0 else None
+                    }
+                }
+                
+                # Update team data (all values above are already native Python types)
+                team_data["season_stats"] = enhanced_stats
+            
+    except Exception as stats_error:
+        print(f"Could not fetch team stats for team {team_id}: {stats_error}")
+        team_data["note"] = "NBA API stats temporarily unavailable"
+    
+    # Try to add real roster data from NBA API
+    try:
+        # Check if client disconnected before roster API call
+        if request and await request.is_disconnected():
+            print(f"🔌 Client disconnected during roster fetch for team {team_id}")
+            return
+            
+        roster_df = await fetch_team_roster(team_id)
+        
+        if not roster_df.empty:
+            roster = frame_to_records(roster_df, ROSTER_FIELDS)
+            
+            # Add player statistics if requested (fetched concurrently under a deadline)
+            if include_player_stats:
+                # Check if client disconnected before player stats API calls
+                if request and await request.is_disconnected():
+                    print(f"🔌 Client disconnected during player stats fetch for team {team_id}")
+                    return
+                
+                stats_summary = await fetch_roster_player_stats(roster)
+                team_data["player_stats_status"] = stats_summary
+                print(f"✅ Fetched player stats for team {team_id}: {stats_summary}")
+            
+            # Add roster to team data
+            team_data["roster"] = roster
+            team_data["roster_count"] = len(roster)
+            
+    except Exception as roster_error:
+        print(f"Could not fetch roster for team {team_id}: {roster_error}")
+        team_data["roster_note"] = "NBA API roster temporarily unavailable"
+        team_data["roster"] = []  # Ensure roster exists as empty array
+        team_data["roster_count"] = 0
+    
+    return team_data
+
 @app.get("/api/team/{team_id}")
-async def get_team_details(team_id: int, include_player_stats: bool = False, request: Request = None):
+async def get_team_details(team_id: int, include_player_stats: bool = False, request: Request = None,
+                           response: Response = None):
     """Get detailed information for a specific team with hardcoded names but real NBA API stats"""
     
     # 🚀 ENHANCED: Log request received
@@ -366,186 +738,100 @@ async def get_team_details(team_id: int, include_player_stats: bool = False, req
         if team_id not in NBA_TEAMS_DATA:
             print(f"❌ Team {team_id} not found in database")
             raise HTTPException(status_code=404, detail="Team not found")
-        
-        print(f"✅ Found team {team_id} in database, processing...")
-        team_info = NBA_TEAMS_DATA[team_id]["basic_info"]
-        
-        # Initialize team data with hardcoded basic info
-        team_data = {
-            "basic_info": {
-                "id": team_id,
-                "full_name": team_info['full_name'],
-                "abbreviation": team_info['abbreviation'],
-                "city": team_info['city'],
-                "nickname": team_info['nickname']
-            },
-            "team_id": team_id
-        }
-        
-        # Try to add real team stats from NBA API
-        try:
-            # Check if client disconnected before expensive API call
-            if request and await request.is_disconnected():
-                print(f"🔌 Client disconnected during team stats fetch for team {team_id}")
-                return
-                
-            team_stats_data = teamdashboardbygeneralsplits.TeamDashboardByGeneralSplits(team_id=team_id)
-            team_stats_df = team_stats_data.get_data_frames()[0]
-            
-            if not team_stats_df.empty:
-                team_stats = team_stats_df.iloc[0]
-                games_played = int(team_stats['GP']) if pd.notna(team_stats['GP']) else 0
-                
-                if games_played:  # Only proceed if we have real data
-                    enhanced_stats = {
-                        "games_played": games_played,
-                        "wins": int(team_stats['W']) if pd.notna(team_stats['W']) else None,
-                        "losses": int(team_stats['L']) if pd.notna(team_stats['L']) else None,
-                        "win_pct": round(float(team_stats['W_PCT']), 3) if pd.notna(team_stats['W_PCT']) else None,
-                        
-                        # Offensive Stats (Per Game)
-                        "offensive_stats": {
-                            "avg_points": round(float(team_stats['PTS']) / games_played, 1) if pd.notna(team_stats['PTS']) else None,
-                            "fg_made": round(float(team_stats['FGM']) / games_played, 1) if pd.notna(team_stats['FGM']) else None,
-                            "fg_attempted": round(float(team_stats['FGA']) / games_played, 1) if pd.notna(team_stats['FGA']) else None,
-                            "fg_pct": round(float(team_stats['FG_PCT']), 3) if pd.notna(team_stats['FG_PCT']) else None,
-                            "three_pt_made": round(float(team_stats['FG3M']) / games_played, 1) if pd.notna(team_stats['FG3M']) else None,
-                            "three_pt_attempted": round(float(team_stats['FG3A']) / games_played, 1) if pd.notna(team_stats['FG3A']) else None,
-                            "three_pt_pct": round(float(team_stats['FG3_PCT']), 3) if pd.notna(team_stats['FG3_PCT']) else None,
-                            "free_throws_made": round(float(team_stats['FTM']) / games_played, 1) if pd.notna(team_stats['FTM']) else None,
-                            "free_throws_attempted": round(float(team_stats['FTA']) / games_played, 1) if pd.notna(team_stats['FTA']) else None,
-                            "free_throw_pct": round(float(team_stats['FT_PCT']), 3) if pd.notna(team_stats['FT_PCT']) else None,
-                            "assists": round(float(team_stats['AST']) / games_played, 1) if pd.notna(team_stats['AST']) else None,
-                            "turnovers": round(float(team_stats['TOV']) / games_played, 1) if pd.notna(team_stats['TOV']) else None,
-                            "offensive_rebounds": round(float(team_stats['OREB']) / games_played, 1) if pd.notna(team_stats['OREB']) else None
-                        },
-                        
-                        # Defensive Stats (Per Game)
-                        "defensive_stats": {
-                            "defensive_rebounds": round(float(team_stats['DREB']) / games_played, 1) if pd.notna(team_stats['DREB']) else None,
-                            "total_rebounds": round(float(team_stats['REB']) / games_played, 1) if pd.notna(team_stats['REB']) else None,
-                            "steals": round(float(team_stats['STL']) / games_played, 1) if pd.notna(team_stats['STL']) else None,
-                            "blocks": round(float(team_stats['BLK']) / games_played, 1) if pd.notna(team_stats['BLK']) else None,
-                            "personal_fouls": round(float(team_stats['PF']) / games_played, 1) if pd.notna(team_stats['PF']) else None
-                        },
-                        
-                        # Advanced Stats
-                        "advanced_stats": {
-                            "plus_minus": round(float(team_stats['PLUS_MINUS']), 1) if pd.notna(team_stats['PLUS_MINUS']) else None,
-                            "true_shooting_pct": round(
-                                float(team_stats['PTS']) / (2 * (float(team_stats['FGA']) + 0.44 * float(team_stats['FTA']))), 3
-                            ) if pd.notna(team_stats['PTS']) and pd.notna(team_stats['FGA']) and pd.notna(team_stats['FTA']) else None,
-                            "effective_fg_pct": round(
-                                (float(team_stats['FGM']) + 0.5 * float(team_stats['FG3M'])) / float(team_stats['FGA']), 3
-                            ) if pd.notna(team_stats['FGM']) and pd.notna(team_stats['FG3M']) and pd.notna(team_stats['FGA']) else None,
-                            "assist_to_turnover_ratio": round(
-                                float(team_stats['AST']) / float(team_stats['TOV']), 2
-                            ) if pd.notna(team_stats['AST']) and pd.notna(team_stats['TOV']) and float(team_stats['TOV']) > 0 else None
-                        }
-                    }
-                    
-                    # Convert numpy types and update team data
-                    enhanced_stats = convert_numpy_types(enhanced_stats)
-                    team_data["season_stats"] = enhanced_stats
-                
-        except Exception as stats_error:
-            print(f"Could not fetch team stats for team {team_id}: {stats_error}")
-            team_data["note"] = "NBA API stats temporarily unavailable"
-        
-        # Try to add real roster data from NBA API
-        try:
-            # Check if client disconnected before roster API call
-            if request and await request.is_disconnected():
-                print(f"🔌 Client disconnected during roster fetch for team {team_id}")
-                return
-                
-            roster_data = commonteamroster.CommonTeamRoster(team_id=team_id)
-            roster_df = roster_data.get_data_frames()[0]
-            
-            if not roster_df.empty:
-                roster = []
-                for _, player in roster_df.iterrows():
-                    player_data = {
-                        "player_id": int(player['PLAYER_ID']) if pd.notna(player['PLAYER_ID']) else None,
-                        "name": str(player['PLAYER']) if pd.notna(player['PLAYER']) else "N/A",
-                        "jersey_number": str(player['NUM']) if pd.notna(player['NUM']) else "N/A",
-                        "position": str(player['POSITION']) if pd.notna(player['POSITION']) else "N/A",
-                        "height": str(player['HEIGHT']) if pd.notna(player['HEIGHT']) else "N/A",
-                        "weight": str(player['WEIGHT']) if pd.notna(player['WEIGHT']) else "N/A",
-                        "birth_date": str(player['BIRTH_DATE']) if pd.notna(player['BIRTH_DATE']) else "N/A",
-                        "age": int(player['AGE']) if pd.notna(player['AGE']) else 0,
-                        "experience": str(player['EXP']) if pd.notna(player['EXP']) else "R",
-                        "school": str(player['SCHOOL']) if pd.notna(player['SCHOOL']) else "N/A"
-                    }
-                    
-                    # Add player statistics if requested
-                    if include_player_stats and player_data["player_id"]:
-                        try:
-                            # Check if client disconnected before player stats API call
-                            if request and await request.is_disconnected():
-                                print(f"🔌 Client disconnected during player stats fetch for {player_data['name']}")
-                                return
-                                
-                            player_stats = playerdashboardbyyearoveryear.PlayerDashboardByYearOverYear(
-                                player_id=player_data["player_id"]
-                            )
-                            season_stats = player_stats.get_data_frames()[1]  # ByYearPlayerDashboard
-                            
-                            if not season_stats.empty:
-                                current_season = season_stats.iloc[0]
-                                player_data["stats"] = {
-                                    "games": int(current_season['GP']) if pd.notna(current_season['GP']) else 0,
-                                    "ppg": round(float(current_season['PTS']) / max(int(current_season['GP']), 1), 1) if pd.notna(current_season['PTS']) and pd.notna(current_season['GP']) else 0.0,
-                                    "rpg": round(float(current_season['REB']) / max(int(current_season['GP']), 1), 1) if pd.notna(current_season['REB']) and pd.notna(current_season['GP']) else 0.0,
-                                    "apg": round(float(current_season['AST']) / max(int(current_season['GP']), 1), 1) if pd.notna(current_season['AST']) and pd.notna(current_season['GP']) else 0.0,
-                                    "fg_pct": round(float(current_season['FG_PCT']), 3) if pd.notna(current_season['FG_PCT']) else 0.0,
-                                    "three_pt_pct": round(float(current_season['FG3_PCT']), 3) if pd.notna(current_season['FG3_PCT']) else 0.0
-                                }
-                                print(f"✅ Fetched stats for {player_data['name']}: {player_data['stats']['ppg']} PPG")
-                            else:
-                                player_data["stats"] = {
-                                    "games": 0, "ppg": 0.0, "rpg": 0.0, "apg": 0.0, "fg_pct": 0.0, "three_pt_pct": 0.0
-                                }
-                        except Exception as player_stats_error:
-                            print(f"❌ Could not fetch stats for {player_data['name']} ({player_data['player_id']}): {player_stats_error}")
-                            player_data["stats"] = {
-                                "games": 0, "ppg": 0.0, "rpg": 0.0, "apg": 0.0, "fg_pct": 0.0, "three_pt_pct": 0.0
-                            }
-                    
-                    roster.append(player_data)
-                
-                # Convert numpy types and add roster to team data
-                roster = convert_numpy_types(roster)
-                team_data["roster"] = roster
-                team_data["roster_count"] = len(roster)
-                
-        except Exception as roster_error:
-            print(f"Could not fetch roster for team {team_id}: {roster_error}")
-            team_data["roster_note"] = "NBA API roster temporarily unavailable"
-            team_data["roster"] = []  # Ensure roster exists as empty array
-            team_data["roster_count"] = 0
-        
-        print(f"✅ Successfully processed team {team_id} request")
-        return convert_numpy_types(team_data)
-        
+
+        # Serve repeat traffic for the same team straight from memory
+        cache_key = make_cache_key("team", team_id=team_id, include_player_stats=include_player_stats)
+        cached_team = team_cache.get(cache_key)
+        if cached_team is not None:
+            print(f"⚡ Cache hit for team {team_id} (include_player_stats={include_player_stats})")
+            return cached_team
+
+        return await load_team_details(team_id, include_player_stats, request, response)
+
     except HTTPException:
         raise
     except Exception as e:
         print(f"❌ Error fetching team data for {team_id}: {e}")
         raise HTTPException(status_code=500, detail="Error fetching team data")
 
+async def load_team_details(team_id: int, include_player_stats: bool = False, request: Request = None,
+                            response: Response = None):
+    """Build a team's details without a cache lookup (batch callers have already checked)
+
+    Complete payloads are cached; partial ones are retried on the next request.
+    """
+    if team_id not in NBA_TEAMS_DATA:
+        raise HTTPException(status_code=404, detail="Team not found")
+
+    team_data = await build_team_details(team_id, include_player_stats, request)
+    if team_data is None:  # client disconnected
+        return
+
+    # Only cache complete payloads so upstream outages are retried on the next request
+    if team_details_complete(team_data):
+        ttl = TEAM_WITH_PLAYER_STATS_TTL if include_player_stats else None
+        cache_key = make_cache_key("team", team_id=team_id, include_player_stats=include_player_stats)
+        team_cache.set(cache_key, team_data, ttl_seconds=ttl)
+    else:
+        mark_uncacheable(response)
+
+    print(f"✅ Successfully processed team {team_id} request")
+    return team_data
+
+async def team_player_ids(team_id: int):
+    """IDs of a team's current players: warehouse season totals, or the (cached) roster"""
+    if warehouse is not None:
+        season = warehouse.current_season("player")
+        if season is not None:
+            totals = await asyncio.to_thread(warehouse.player_totals, season)
+            return set(totals.index[totals["TEAM_ID"].to_numpy() == team_id].tolist())
+    roster_df = await fetch_team_roster(team_id)
+    return set(int(player_id) for player_id in roster_df["PLAYER_ID"].tolist()) if not roster_df.empty else set()
+
+@app.get("/api/players/search")
+async def search_players(q: str, limit: int = 10, active: Optional[bool] = None,
+                         team_id: Optional[int] = None, response: Response = None):
+    """Type-ahead player search: ranked prefix matches on any name word, fuzzy matches for typos"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query parameter q must not be empty")
+    if limit < 1 or limit > SEARCH_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {SEARCH_MAX_LIMIT}")
+    if team_id is not None and team_id not in NBA_TEAMS_DATA:
+        raise HTTPException(status_code=404, detail="Team not found")
+    
+    team_ids = None
+    if team_id is not None:
+        try:
+            team_ids = await team_player_ids(team_id)
+        except Exception as e:
+            print(f"Error resolving players for team {team_id}: {e}")
+            raise HTTPException(status_code=503, detail="Team roster temporarily unavailable")
+    
+    results = player_search_index.search(q, limit=limit, active=active, team_player_ids=team_ids)
+    if response is not None:
+        # Set here so the ETag layer passes these small, per-keystroke responses straight through
+        response.headers["Cache-Control"] = "public, max-age=3600"
+    return {"query": q, "results": results, "count": len(results)}
+
 @app.get("/api/player/{player_id}")
-async def get_player_details(player_id: int, request: Request = None):
+async def get_player_details(player_id: int, request: Request = None, response: Response = None):
     """Get detailed information for a specific player"""
+    # Check if client disconnected
+    if request and await request.is_disconnected():
+        print(f"🔌 Client disconnected for player {player_id} request")
+        return
+
+    cached_player = player_cache.get(make_cache_key("player", player_id=player_id))
+    if cached_player is not None:
+        return cached_player
+    return await load_player_details(player_id, request, response)
+
+async def load_player_details(player_id: int, request: Request = None, response: Response = None):
+    """Build and cache a player's details without a cache lookup (batch callers have already checked)"""
     try:
-        # Check if client disconnected
-        if request and await request.is_disconnected():
-            print(f"🔌 Client disconnected for player {player_id} request")
-            return
-            
         # Get player basic info
-        player_info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
-        player_data = player_info.get_data_frames()[0].iloc[0]
+        player_info_frames = await upstream.fetch_frames(commonplayerinfo.CommonPlayerInfo, player_id=player_id)
+        player_data = player_info_frames[0].iloc[0]
         
         # Check if client disconnected before additional API call
         if request and await request.is_disconnected():
@@ -553,10 +839,7 @@ async def get_player_details(player_id: int, request: Request = None):
             return
             
         # Get player season stats
-        player_stats = playerdashboardbyyearoveryear.PlayerDashboardByYearOverYear(
-            player_id=player_id
-        )
-        season_stats = player_stats.get_data_frames()[1]  # ByYearPlayerDashboard
+        season_stats = await fetch_player_season_stats(player_id)
         
         current_season = season_stats.iloc[0] if not season_stats.empty else None
         
@@ -580,12 +863,13 @@ async def get_player_details(player_id: int, request: Request = None):
             }
         }
         
-        # Convert numpy types to native Python types
-        player_details = convert_numpy_types(player_details)
+        player_cache.set(make_cache_key("player", player_id=player_id), player_details)
         
         return player_details
         
     except Exception as e:
+        print(f"❌ Error fetching player {player_id}: {e}")
+        mark_uncacheable(response)
         # Return mock player data
         return {
             "basic_info": {
@@ -608,70 +892,215 @@ async def get_player_details(player_id: int, request: Request = None):
             "note": "Using mock data - NBA API may be rate limited"
         }
 
-@app.get("/api/predictions/player/{player_id}")
-async def predict_player_stats(player_id: int):
-    """Get predictions for player performance based on current season stats"""
-    try:
-        player_data = await get_player_details(player_id)
-        current_stats = player_data["current_season"]
-        
-        # Use player_id as seed for consistent predictions
-        np.random.seed(player_id)
-        
-        # Calculate predictions based on current stats with realistic variance
-        next_game_variance = 0.15  # 15% variance for next game
-        season_variance = 0.05     # 5% variance for season projection
-        
-        # Next game predictions (higher variance)
-        points_multiplier = 1.0 + (np.random.random() - 0.5) * 2 * next_game_variance
-        rebounds_multiplier = 1.0 + (np.random.random() - 0.5) * 2 * next_game_variance
-        assists_multiplier = 1.0 + (np.random.random() - 0.5) * 2 * next_game_variance
-        
-        # Season projections (lower variance)
-        season_points_multiplier = 1.0 + (np.random.random() - 0.5) * 2 * season_variance
-        season_rebounds_multiplier = 1.0 + (np.random.random() - 0.5) * 2 * season_variance
-        season_assists_multiplier = 1.0 + (np.random.random() - 0.5) * 2 * season_variance
+# Batch lookups: limits on request size and on concurrent upstream work per batch
+BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", "100"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+class PlayerBatchRequest(BaseModel):
+    player_ids: List[int]
+
+class TeamBatchRequest(BaseModel):
+    team_ids: List[int]
+    include_player_stats: bool = False
+
+def dedupe_ids(ids: List[int]) -> List[int]:
+    """Drop duplicate IDs while keeping request order"""
+    return list(dict.fromkeys(ids))
+
+async def run_batch(ids: List[int], cache, cache_key_fn, fetch_one):
+    """Serve each ID from cache when possible and fetch the rest concurrently
+
+    Returns a dict of id -> {"status": ..., "data": ...} where status is one of
+    cached, ok, fallback, not_found or error.
+    """
+    results = {}
+    missing = []
+    for item_id in ids:
+        cached = cache.get(cache_key_fn(item_id))
+        if cached is not None:
+            results[item_id] = {"status": "cached", "data": cached}
+        else:
+            missing.append(item_id)
+    
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def fetch_with_status(item_id):
+        async with semaphore:
+            try:
+                data = await fetch_one(item_id)
+            except HTTPException as e:
+                return item_id, {"status": "not_found" if e.status_code == 404 else "error", "data": None, "error": e.detail}
+            except Exception as e:
+                return item_id, {"status": "error", "data": None, "error": str(e)}
+            # Endpoints signal mock/partial data with a note instead of raising
+            status = "fallback" if isinstance(data, dict) and "note" in data else "ok"
+            return item_id, {"status": status, "data": data}
+    
+    for item_id, result in await asyncio.gather(*(fetch_with_status(item_id) for item_id in missing)):
+        results[item_id] = result
+    return results
+
+def batch_response(ids: List[int], results: dict, key_name: str):
+    items = [{key_name: item_id, **results[item_id]} for item_id in ids]
+    status_counts = {}
+    for item in items:
+        status_counts[item["status"]] = status_counts.get(item["status"], 0) + 1
+    return {"items": items, "count": len(items), "status_counts": status_counts}
+
+@app.post("/api/players/batch")
+async def get_players_batch(batch: PlayerBatchRequest):
+    """Get details for many players in one round-trip"""
+    player_ids = dedupe_ids(batch.player_ids)
+    if len(player_ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} player IDs per batch")
+    
+    results = await run_batch(
+        player_ids, player_cache,
+        lambda player_id: make_cache_key("player", player_id=player_id),
+        lambda player_id: load_player_details(player_id)
+    )
+    return batch_response(player_ids, results, "player_id")
+
+@app.post("/api/teams/batch")
+async def get_teams_batch(batch: TeamBatchRequest):
+    """Get details for many teams in one round-trip"""
+    team_ids = dedupe_ids(batch.team_ids)
+    if len(team_ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} team IDs per batch")
+    
+    include_player_stats = batch.include_player_stats
+    results = await run_batch(
+        team_ids, team_cache,
+        lambda team_id: make_cache_key("team", team_id=team_id, include_player_stats=include_player_stats),
+        lambda team_id: load_team_details(team_id, include_player_stats=include_player_stats)
+    )
+    return batch_response(team_ids, results, "team_id")
+
+def prediction_analysis(current_stats: dict, points_ratio: float) -> dict:
+    """Trend and strengths/weaknesses from per-game stats and predicted vs current scoring"""
+    analysis = {
+        "trending": "up" if points_ratio > 1.05 else "down" if points_ratio < 0.95 else "stable",
+        "key_strengths": [],
+        "areas_for_improvement": []
+    }
+    
+    # Add contextual analysis based on stats
+    if current_stats["ppg"] > 25:
+        analysis["key_strengths"].append("Elite scorer")
+    if current_stats["rpg"] > 8:
+        analysis["key_strengths"].append("Strong rebounder")
+    if current_stats["apg"] > 7:
+        analysis["key_strengths"].append("Excellent playmaker")
+    if current_stats["fg_pct"] > 0.50:
+        analysis["key_strengths"].append("Efficient shooter")
+    if current_stats["three_pt_pct"] > 0.35:
+        analysis["key_strengths"].append("Good 3-point shooter")
         
-        predictions = {
+    # Areas for improvement
+    if current_stats["fg_pct"] < 0.45:
+        analysis["areas_for_improvement"].append("Field goal efficiency")
+    if current_stats["three_pt_pct"] < 0.30:
+        analysis["areas_for_improvement"].append("3-point shooting")
+    
+    return analysis
+
+def model_predictions(model, rows) -> List[dict]:
+    """Predictions for snapshot rows of the trained model, computed in one vectorized pass"""
+    predicted = model.predict_rows(rows)
+    # Round whole columns at once and convert to native floats before building dicts
+    def column(values, digits=1):
+        return np.round(values, digits).tolist()
+    
+    games = model.feature(rows, "games_played").astype(np.int64).tolist()
+    ppg, rpg, apg = (column(model.feature(rows, name)) for name in ("pts_avg", "reb_avg", "ast_avg"))
+    fg_pct, three_pt_pct = (column(model.feature(rows, name), 3) for name in ("fg_pct_avg", "fg3_pct_avg"))
+    confidence = column(model.confidence(model.feature(rows, "games_played")), 2)
+    points_ratio = (model.target(predicted, "next_pts") / np.maximum(model.feature(rows, "pts_avg"), 0.1)).tolist()
+    next_pts, next_reb, next_ast = (column(model.target(predicted, name)) for name in ("next_pts", "next_reb", "next_ast"))
+    season_pts, season_reb, season_ast = (column(model.target(predicted, name)) for name in ("season_pts", "season_reb", "season_ast"))
+    
+    results = []
+    for i in range(len(rows)):
+        current_stats = {
+            "games": games[i],
+            "ppg": ppg[i],
+            "rpg": rpg[i],
+            "apg": apg[i],
+            "fg_pct": fg_pct[i],
+            "three_pt_pct": three_pt_pct[i]
+        }
+        results.append({
             "next_game": {
-                "predicted_points": round(current_stats["ppg"] * points_multiplier, 1),
-                "predicted_rebounds": round(current_stats["rpg"] * rebounds_multiplier, 1),
-                "predicted_assists": round(current_stats["apg"] * assists_multiplier, 1),
-                "confidence": round(0.75 + (current_stats["games"] / 100) * 0.15, 2)  # Higher confidence with more games played
+                "predicted_points": next_pts[i],
+                "predicted_rebounds": next_reb[i],
+                "predicted_assists": next_ast[i],
+                "confidence": confidence[i]
             },
             "season_projection": {
-                "projected_ppg": round(current_stats["ppg"] * season_points_multiplier, 1),
-                "projected_rpg": round(current_stats["rpg"] * season_rebounds_multiplier, 1),
-                "projected_apg": round(current_stats["apg"] * season_assists_multiplier, 1)
+                "projected_ppg": season_pts[i],
+                "projected_rpg": season_reb[i],
+                "projected_apg": season_ast[i]
             },
-            "analysis": {
-                "trending": "up" if points_multiplier > 1.05 else "down" if points_multiplier < 0.95 else "stable",
-                "key_strengths": [],
-                "areas_for_improvement": []
-            }
-        }
-        
-        # Add contextual analysis based on stats
-        if current_stats["ppg"] > 25:
-            predictions["analysis"]["key_strengths"].append("Elite scorer")
-        if current_stats["rpg"] > 8:
-            predictions["analysis"]["key_strengths"].append("Strong rebounder")
-        if current_stats["apg"] > 7:
-            predictions["analysis"]["key_strengths"].append("Excellent playmaker")
-        if current_stats["fg_pct"] > 0.50:
-            predictions["analysis"]["key_strengths"].append("Efficient shooter")
-        if current_stats["three_pt_pct"] > 0.35:
-            predictions["analysis"]["key_strengths"].append("Good 3-point shooter")
-            
-        # Areas for improvement
-        if current_stats["fg_pct"] < 0.45:
-            predictions["analysis"]["areas_for_improvement"].append("Field goal efficiency")
-        if current_stats["three_pt_pct"] < 0.30:
-            predictions["analysis"]["areas_for_improvement"].append("3-point shooting")
+            "analysis": prediction_analysis(current_stats, points_ratio[i]),
+            "current_season": current_stats,
+            "model": {"source": "trained", "version": model.version}
+        })
+    return results
+
+def heuristic_predictions(player_id: int, current_stats: dict) -> dict:
+    """Fallback for players outside the trained model: current averages with seeded variance"""
+    # A generator keyed by player_id gives consistent predictions without touching
+    # global NumPy state, so concurrent requests cannot disturb each other
+    rng = keyed_rng("player_prediction", player_id)
+    
+    # Calculate predictions based on current stats with realistic variance
+    next_game_variance = 0.15  # 15% variance for next game
+    season_variance = 0.05     # 5% variance for season projection
+    
+    # Next game predictions (higher variance), then season projections (lower variance)
+    points_multiplier, rebounds_multiplier, assists_multiplier = (
+        1.0 + rng.uniform(-next_game_variance, next_game_variance, size=3)).tolist()
+    season_points_multiplier, season_rebounds_multiplier, season_assists_multiplier = (
+        1.0 + rng.uniform(-season_variance, season_variance, size=3)).tolist()
+    
+    return {
+        "next_game": {
+            "predicted_points": round(current_stats["ppg"] * points_multiplier, 1),
+            "predicted_rebounds": round(current_stats["rpg"] * rebounds_multiplier, 1),
+            "predicted_assists": round(current_stats["apg"] * assists_multiplier, 1),
+            "confidence": round(0.75 + (current_stats["games"] / 100) * 0.15, 2)  # Higher confidence with more games played
+        },
+        "season_projection": {
+            "projected_ppg": round(current_stats["ppg"] * season_points_multiplier, 1),
+            "projected_rpg": round(current_stats["rpg"] * season_rebounds_multiplier, 1),
+            "projected_apg": round(current_stats["apg"] * season_assists_multiplier, 1)
+        },
+        "analysis": prediction_analysis(current_stats, points_multiplier),
+        "current_season": current_stats,
+        "model": {"source": "heuristic"}
+    }
+
+@app.get("/api/predictions/player/{player_id}")
+async def predict_player_stats(player_id: int, response: Response = None):
+    """Get predictions for player performance from the trained model (no upstream call)"""
+    model = ml_models.get("player_stats")
+    if model is not None:
+        rows = model.rows_for([player_id])
+        if rows[0] >= 0:
+            return model_predictions(model, rows)[0]
+    
+    # Players the model has not seen fall back to the heuristic on live season stats
+    try:
+        player_data = await get_player_details(player_id)
+        current_stats = player_data["current_season"]
+        if "note" in player_data:
+            mark_uncacheable(response)  # Predictions built on mock player data
         
-        return predictions
+        return heuristic_predictions(player_id, current_stats)
         
     except Exception as e:
+        print(f"❌ Error building predictions for player {player_id}: {e}")
+        mark_uncacheable(response)
         # Return mock predictions if API fails
         return {
             "next_game": {
@@ -693,6 +1122,137 @@ async def predict_player_stats(player_id: int):
             "note": "Using mock predictions - player data may be unavailable"
         }
 
+# Batch predictions: known players are scored in one matrix product over the model snapshot
+PREDICTION_BATCH_MAX_IDS = int(os.getenv("PREDICTION_BATCH_MAX_IDS", "1000"))
+
+class PredictionBatchRequest(BaseModel):
+    player_ids: List[int]
+    include_fallback: bool = False  # fetch live stats for players the model does not know
+
+async def batch_predictions(player_ids: List[int], include_fallback: bool = False) -> dict:
+    """Predict many players at once; returns player_id -> {"status": ..., "data": ...}
+
+    Status is model (trained model), heuristic (fallback on cached or fetched stats),
+    not_modeled (unknown to the model and not fetched), or a run_batch failure status.
+    """
+    results = {}
+    missing = player_ids
+    model = ml_models.get("player_stats")
+    if model is not None:
+        rows = model.rows_for(player_ids)
+        known = rows >= 0
+        known_ids = np.asarray(player_ids, dtype=np.int64)[known].tolist()
+        for player_id, prediction in zip(known_ids, model_predictions(model, rows[known])):
+            results[player_id] = {"status": "model", "data": prediction}
+        missing = [player_id for player_id, found in zip(player_ids, known) if not found]
+    
+    # Outside the model: heuristic on already-cached player stats, live fetch only on request
+    if include_fallback:
+        # run_batch does the single cache lookup per player and fetches only the misses
+        fetched = await run_batch(
+            missing, player_cache,
+            lambda player_id: make_cache_key("player", player_id=player_id),
+            lambda player_id: load_player_details(player_id)
+        )
+        for player_id, result in fetched.items():
+            if result["status"] in ("ok", "cached"):
+                current_stats = result["data"]["current_season"]
+                results[player_id] = {"status": "heuristic", "data": heuristic_predictions(player_id, current_stats)}
+            else:
+                results[player_id] = {**result, "data": None}
+    else:
+        for player_id in missing:
+            cached = player_cache.get(make_cache_key("player", player_id=player_id))
+            if cached is not None:
+                results[player_id] = {"status": "heuristic", "data": heuristic_predictions(player_id, cached["current_season"])}
+            else:
+                results[player_id] = {"status": "not_modeled", "data": None}
+    return results
+
+@app.post("/api/predictions/batch")
+async def predict_players_batch(batch: PredictionBatchRequest):
+    """Next-game and season projections for many players in one vectorized model call"""
+    player_ids = dedupe_ids(batch.player_ids)
+    if len(player_ids) > PREDICTION_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {PREDICTION_BATCH_MAX_IDS} player IDs per batch")
+    
+    results = await batch_predictions(player_ids, include_fallback=batch.include_fallback)
+    return batch_response(player_ids, results, "player_id")
+
+@app.get("/api/predictions/team/{team_id}")
+async def predict_team(team_id: int, include_fallback: bool = False, response: Response = None):
+    """Predictions for a team's whole roster in one vectorized model call"""
+    team_info = TEAM_INDEX.get(team_id)
+    if team_info is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    
+    try:
+        roster_df = await fetch_team_roster(team_id)
+    except Exception as e:
+        print(f"Error fetching roster for team {team_id} predictions: {e}")
+        raise HTTPException(status_code=503, detail="Team roster is temporarily unavailable")
+    
+    roster = frame_to_records(roster_df, [
+        Field("player_id", "PLAYER_ID", cast="int"),
+        Field("name", "PLAYER", default="Unknown"),
+        Field("position", "POSITION", default="N/A")
+    ])
+    player_ids = dedupe_ids([player["player_id"] for player in roster])
+    results = await batch_predictions(player_ids, include_fallback=include_fallback)
+    if any(results[player_id]["status"] not in ("model", "heuristic") for player_id in player_ids):
+        mark_uncacheable(response)
+    
+    players_by_id = {player["player_id"]: player for player in roster}
+    batch = batch_response(player_ids, results, "player_id")
+    for item in batch["items"]:
+        player = players_by_id[item["player_id"]]
+        item["name"] = player["name"]
+        item["position"] = player["position"]
+    
+    return {
+        "team_id": team_id,
+        "team_name": team_info["full_name"],
+        "players": batch["items"],
+        "count": batch["count"],
+        "status_counts": batch["status_counts"]
+    }
+
+@app.get("/api/models")
+async def get_models():
+    """Describe the loaded prediction models, with load time and memory per model"""
+    model = ml_models.get("player_stats")
+    return {
+        "player_stats": model.info() if model is not None else None,
+        "registry": ml_models.stats()
+    }
+
+@app.post("/api/models/reload")
+async def reload_models(force: bool = False):
+    """Load new model artifact versions now instead of waiting for the watcher"""
+    swapped = await asyncio.to_thread(ml_models.load_all, force)
+    return {"swapped": swapped, "registry": ml_models.stats()}
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss counters and sizes for the in-memory response caches"""
+    return {
+        "team_cache": team_cache.stats(),
+        "player_cache": player_cache.stats(),
+        "roster_cache": roster_cache.stats(),
+        "standings_swr": standings_swr.stats(),
+        "leaders_swr": leaders_swr.stats(),
+        "prewarm": cache_warmer.stats(),
+        "http": http_validators.stats(),
+        "compression": compression_stats.stats(),
+        "warehouse": warehouse.stats() if warehouse is not None else None,
+        "standings_engine": standings_engine.stats()
+    }
+
+@app.get("/api/metrics/upstream")
+async def get_upstream_metrics():
+    """Get upstream call counters, including how many calls were coalesced"""
+    return upstream.snapshot()
+
 # SUSPENDED: News API endpoint
 # @app.get("/api/news")
 # async def get_nba_news():
@@ -703,40 +1263,43 @@ async def predict_player_stats(player_id: int):
 #         "note": "News API suspended"
 #     }
 
+def prewarm_jobs():
+    """Yield (name, job) pairs covering standings, the leaders table and all 30 teams"""
+    yield "standings", prewarm_standings
+    
+    # One leaders table serves every category; Totals is the default view, PerGame the other common one
+    for per_mode in ("Totals", "PerGame"):
+        leaders_key = ("league_leaders", LEADERS_SEASON, per_mode)
+        if not leaders_swr.is_fresh(leaders_key):
+            yield f"leaders:{per_mode}", lambda leaders_key=leaders_key, per_mode=per_mode: leaders_swr.refresh(
+                leaders_key, lambda: load_league_leaders_frame(LEADERS_SEASON, per_mode)
+            )
+    
+    for team_id in NBA_TEAMS_DATA:
+        yield f"team:{team_id}", lambda team_id=team_id: prewarm_team(team_id)
+
+async def prewarm_standings():
+    """Refresh the NBA API standings unless local standings are being served"""
+    if await local_standings_payload() is None and not standings_swr.is_fresh(("standings",)):
+        await standings_swr.refresh(("standings",), load_standings_payload)
+
+async def prewarm_team(team_id: int):
+    """Rebuild the cached team payload (dashboard + roster) ahead of its expiry"""
+    # The cached payload keeps serving until a complete replacement is ready
+    team_data = await build_team_details(team_id)
+    if not team_details_complete(team_data):
+        raise RuntimeError("NBA API returned an incomplete team payload; keeping the cached one")
+    team_cache.set(make_cache_key("team", team_id=team_id, include_player_stats=False), team_data)
+
+cache_warmer = CacheWarmer(prewarm_jobs, upstream.count_calls)
+
 @app.get("/api/nba-teams")
-async def get_nba_teams():
-    """Get all 30 NBA teams with their IDs and basic info"""
-    try:
-        # Get teams from NBA API static data
-        nba_teams_static = teams.get_teams()
-        
-        nba_teams = []
-        for team in nba_teams_static:
-            nba_teams.append({
-                "id": team["id"],
-                "full_name": team["full_name"],
-                "abbreviation": team["abbreviation"],
-                "city": team["city"],
-                "nickname": team["nickname"]
-            })
-        
-        # Sort by full name
-        nba_teams.sort(key=lambda x: x["full_name"])
-        
-        # Organize by conference (basic organization)
-        eastern_teams = nba_teams[:15]  # First 15 alphabetically (rough approximation)
-        western_teams = nba_teams[15:]  # Last 15 alphabetically
-        
-        return {
-            "teams": nba_teams,
-            "count": len(nba_teams),
-            "eastern_conference": eastern_teams,
-            "western_conference": western_teams
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_nba_teams(request: Request = None):
+    """Get all 30 NBA teams with their IDs and basic info (pre-serialized at import, ETag aware)"""
+    return TEAM_INDEX.nba_teams_response.response(request)
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
@@ -0,0 +1,177 @@
+# Registry of loaded ML models with memory-mapped artifacts and hot reload
+# Artifacts are opened with joblib mmap_mode, so their arrays live in the OS page cache and
+# are shared by every worker process instead of being copied into each one. A changed file
+# is loaded in the background and swapped in with a single reference assignment.
+
+import asyncio
+import os
+import resource
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# How often artifact files are checked for a new version (0 disables the watcher)
+MODEL_RELOAD_INTERVAL_SECONDS = float(os.getenv("MODEL_RELOAD_INTERVAL_SECONDS", "30"))
+# "r" maps arrays read-only; set MODEL_MMAP_MODE=none to load them onto the heap
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE", "r")
+if MODEL_MMAP_MODE.lower() == "none":
+    MODEL_MMAP_MODE = None
+
+LoadedModel = namedtuple("LoadedModel", ["model", "path", "signature", "loaded_at", "load_seconds"])
+
+
+def _file_signature(path):
+    """Identity of the file currently at path; an atomic replace always changes the inode"""
+    stat = os.stat(path)
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _array_bytes(model):
+    mapped, heap = 0, 0
+    for value in vars(model).values():
+        if isinstance(value, np.memmap):
+            mapped += value.nbytes
+        elif isinstance(value, np.ndarray):
+            heap += value.nbytes
+    return mapped, heap
+
+
+def _mapping_memory(inode):
+    """Rss/Pss/shared bytes of the mappings of one file in this process (Linux only)"""
+    totals = {"rss_bytes": 0, "pss_bytes": 0, "shared_bytes": 0}
+    fields = {"Rss:": "rss_bytes", "Pss:": "pss_bytes", "Shared_Clean:": "shared_bytes", "Shared_Dirty:": "shared_bytes"}
+    try:
+        with open("/proc/self/smaps") as smaps:
+            matching = False
+            for line in smaps:
+                parts = line.split()
+                if "-" in parts[0]:
+                    # Mapping header: address perms offset dev inode [path]
+                    matching = len(parts) >= 5 and parts[4] == str(inode)
+                elif matching and parts[0] in fields:
+                    totals[fields[parts[0]]] += int(parts[1]) * 1024
+    except OSError:
+        return None
+    return totals
+
+
+def process_rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # No /proc (e.g. macOS): peak RSS is the best portable approximation, reported in bytes there
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class ModelRegistry:
+    """Named models loaded from artifact files, reloaded when the file changes
+
+    Readers call get(name) once per request and keep using that object, so a swap
+    never changes a model halfway through a request. A replaced artifact stays mapped
+    until the last reference to the old model is dropped.
+    """
+
+    def __init__(self, mmap_mode=MODEL_MMAP_MODE, reload_interval=MODEL_RELOAD_INTERVAL_SECONDS):
+        self.mmap_mode = mmap_mode
+        self.reload_interval = reload_interval
+        self._specs = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._task = None
+        self.reloads = 0
+        self.reload_failures = 0
+
+    def register(self, name, path, loader):
+        """loader(path, mmap_mode) -> model"""
+        self._specs[name] = (path, loader)
+
+    def get(self, name):
+        entry = self._entries.get(name)
+        return entry.model if entry is not None else None
+
+    def load(self, name, force=False) -> bool:
+        """Load (or reload) one model if its file changed; returns True when a new model was swapped in"""
+        path, loader = self._specs[name]
+        with self._lock:
+            current = self._entries.get(name)
+            try:
+                signature = _file_signature(path)
+            except FileNotFoundError:
+                # Keep serving the loaded model (if any); only explicit loads report the gap
+                if force:
+                    print(f"⚠️ Model artifact for {name} not found at {path}")
+                return False
+            if current is not None and current.signature == signature and not force:
+                return False
+
+            started = time.perf_counter()
+            try:
+                model = loader(path, self.mmap_mode)
+            except Exception as e:
+                self.reload_failures += 1
+                print(f"⚠️ Failed to load model {name} from {path}: {e}")
+                return False
+            load_seconds = time.perf_counter() - started
+
+            # Single reference assignment: readers see either the old or the new model
+            self._entries[name] = LoadedModel(model, path, signature, time.time(), load_seconds)
+            if current is not None:
+                self.reloads += 1
+            version = getattr(model, "version", "?")
+            print(f"🤖 {'Reloaded' if current is not None else 'Loaded'} model {name} {version} "
+                  f"in {load_seconds * 1000:.1f} ms")
+            return True
+
+    def load_all(self, force=False):
+        return {name: self.load(name, force=force) for name in self._specs}
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await asyncio.to_thread(self.load_all)
+
+    def start_watching(self):
+        if self.reload_interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop_watching(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        models = {}
+        for name, (path, _) in self._specs.items():
+            entry = self._entries.get(name)
+            if entry is None:
+                models[name] = {"loaded": False, "path": path}
+                continue
+            mapped, heap = _array_bytes(entry.model)
+            models[name] = {
+                "loaded": True,
+                "path": path,
+                "version": getattr(entry.model, "version", None),
+                "loaded_at": entry.loaded_at,
+                "load_ms": round(entry.load_seconds * 1000, 2),
+                "mapped_array_bytes": mapped,
+                "heap_array_bytes": heap,
+                "resident": _mapping_memory(entry.signature[0]) if mapped else None
+            }
+        return {
+            "mmap_mode": self.mmap_mode,
+            "reload_interval_seconds": self.reload_interval,
+            "watching": self._task is not None and not self._task.done(),
+            "reloads": self.reloads,
+            "reload_failures": self.reload_failures,
+            "process_rss_bytes": process_rss_bytes(),
+            "models": models
+        }
@@ -195,10 +195,15 @@ NBA_TEAMS_DATA = {
     }
 }
 
-def generate_automatic_team_data(team_id: int):
-    """Generate comprehensive team data automatically for all 30 NBA teams"""
-    import random
-    from datetime import datetime, timedelta
+def generate_automatic_team_data(team_id: int, rng=None):
+    """Generate comprehensive team data automatically for all 30 NBA teams
+    
+    Draws come from a generator keyed by team and day, so the mock data is stable
+    across requests and threads and changes once a day.
+    """
+    from datetime import date
+    import numpy as np
+    from keyed_random import keyed_rng
     
     # Get team info from database
     team_info = NBA_TEAMS_DATA.get(team_id)
@@ -217,10 +222,13 @@ def generate_automatic_team_data(team_id: int):
     
     tier = team_info["performance_tier"]
     stats_range = performance_stats[tier]
+    if rng is None:
+        rng = keyed_rng("team_data", team_id, date.today().isoformat())
     
-    # Generate realistic season stats
-    games_played = random.randint(60, 70)
-    win_pct = random.uniform(*stats_range["win_pct"])
+    # Generate realistic season stats (one vectorized draw for all ranges)
+    games_played = int(rng.integers(60, 71))
+    ranges = np.array([stats_range[name] for name in ("win_pct", "ppg", "opp_ppg", "fg_pct", "three_pct")])
+    win_pct, ppg, opp_ppg, fg_pct, three_pct = rng.uniform(ranges[:, 0], ranges[:, 1]).tolist()
     wins = int(games_played * win_pct)
     losses = games_played - wins
     
@@ -228,14 +236,14 @@ def generate_automatic_team_data(team_id: int):
         "games_played": games_played,
         "wins": wins,
         "losses": losses,
-        "avg_points": round(random.uniform(*stats_range["ppg"]), 1),
-        "avg_opp_points": round(random.uniform(*stats_range["opp_ppg"]), 1),
-        "fg_pct": round(random.uniform(*stats_range["fg_pct"]), 3),
-        "three_pt_pct": round(random.uniform(*stats_range["three_pct"]), 3)
+        "avg_points": round(ppg, 1),
+        "avg_opp_points": round(opp_ppg, 1),
+        "fg_pct": round(fg_pct, 3),
+        "three_pt_pct": round(three_pct, 3)
     }
     
     # Generate recent form based on performance tier
-    recent_form = generate_recent_form_advanced(tier, team_info)
+    recent_form = generate_recent_form_advanced(tier, team_info, rng=rng)
     
     return {
         "basic_info": team_info["basic_info"],
@@ -252,10 +260,15 @@ def generate_automatic_team_data(team_id: int):
         }
     }
 
-def generate_recent_form_advanced(tier: str, team_info: dict):
-    """Generate advanced recent form with rivalry considerations"""
-    import random
-    from datetime import datetime, timedelta
+def generate_recent_form_advanced(tier: str, team_info: dict, rng=None, games: int = 10):
+    """Generate advanced recent form with rivalry considerations
+    
+    All games are drawn at once from an isolated generator (keyed by team and day
+    unless one is passed in), so concurrent calls never share random state.
+    """
+    from datetime import date, datetime, timedelta
+    import numpy as np
+    from keyed_random import keyed_rng
     
     # Win probabilities by tier
     win_probabilities = {
@@ -269,52 +282,56 @@ def generate_recent_form_advanced(tier: str, team_info: dict):
     win_prob = win_probabilities[tier]
     recent_games = []
     
-    # All NBA team abbreviations for realistic opponents
-    all_teams = [data["basic_info"]["abbreviation"] for data in NBA_TEAMS_DATA.values()]
-    current_team = team_info["basic_info"]["abbreviation"]
+    # Opponent and rival abbreviations are precomputed once in the team index
+    from team_index import TEAM_INDEX
+    team_id = team_info["basic_info"].get("id")
+    if team_id in TEAM_INDEX.by_id:
+        opponents = TEAM_INDEX.opponents_of[team_id]
+        rival_teams = TEAM_INDEX.rivals_of[team_id]
+    else:
+        # Unknown team: every indexed team is a possible opponent
+        current_team = team_info["basic_info"]["abbreviation"]
+        opponents = [team for team in TEAM_INDEX.abbreviations if team != current_team]
+        rival_teams = [TEAM_INDEX.by_id[rid]["abbreviation"] for rid in team_info.get("rivalries", []) if rid in TEAM_INDEX.by_id]
     
-    # Remove current team from opponents
-    opponents = [team for team in all_teams if team != current_team]
+    if rng is None:
+        rng = keyed_rng("recent_form", team_id if team_id is not None else team_info["basic_info"]["abbreviation"],
+                        date.today().isoformat())
     
-    for i in range(10):
-        date = (datetime.now() - timedelta(days=i*3)).strftime("%Y-%m-%d")
-        opponent = random.choice(opponents)
-        
+    # Generate realistic scores based on team strength
+    base_score = {
+        "championship": (115, 125),
+        "elite": (110, 120),
+        "playoff": (105, 115),
+        "developing": (100, 110),
+        "rebuilding": (95, 105)
+    }[tier]
+    
+    # Vectorized draws for every game: opponent, rivalry swap, venue, result and scores
+    opponent_picks = rng.integers(len(opponents), size=games)
+    rival_rolls = rng.random(games)
+    rival_picks = rng.integers(max(len(rival_teams), 1), size=games)
+    is_home = rng.random(games) < 0.5
+    # Determine win/loss with some variance
+    won = rng.random(games) < win_prob
+    winner_pts = rng.integers(base_score[0], base_score[1] + 1, size=games)
+    loser_pts = rng.integers(np.maximum(90, winner_pts - 15), winner_pts)
+    
+    today = datetime.now()
+    for i in range(games):
+        opponent = opponents[opponent_picks[i]]
         # Higher chance of playing rivals
-        if random.random() < 0.3 and team_info.get("rivalries"):
-            rival_ids = team_info["rivalries"]
-            rival_teams = [NBA_TEAMS_DATA[rid]["basic_info"]["abbreviation"] for rid in rival_ids if rid in NBA_TEAMS_DATA]
-            if rival_teams:
-                opponent = random.choice(rival_teams)
-        
-        is_home = random.choice([True, False])
-        matchup = f"vs {opponent}" if is_home else f"@ {opponent}"
-        
-        # Determine win/loss with some variance
-        won = random.random() < win_prob
-        
-        # Generate realistic scores based on team strength
-        base_score = {
-            "championship": (115, 125),
-            "elite": (110, 120),
-            "playoff": (105, 115),
-            "developing": (100, 110),
-            "rebuilding": (95, 105)
-        }[tier]
-        
-        if won:
-            team_pts = random.randint(*base_score)
-            opp_pts = random.randint(max(90, team_pts-15), team_pts-1)
-        else:
-            opp_pts = random.randint(*base_score)
-            team_pts = random.randint(max(90, opp_pts-15), opp_pts-1)
+        if rival_rolls[i] < 0.3 and rival_teams:
+            opponent = rival_teams[rival_picks[i]]
+        matchup = f"vs {opponent}" if is_home[i] else f"@ {opponent}"
+        team_pts, opp_pts = (winner_pts[i], loser_pts[i]) if won[i] else (loser_pts[i], winner_pts[i])
         
         recent_games.append({
-            "GAME_DATE": date,
+            "GAME_DATE": (today - timedelta(days=i*3)).strftime("%Y-%m-%d"),
             "MATCHUP": matchup,
-            "WL": "W" if won else "L",
-            "PTS": team_pts,
-            "OPP_PTS": opp_pts
+            "WL": "W" if won[i] else "L",
+            "PTS": int(team_pts),
+            "OPP_PTS": int(opp_pts)
         })
     
     return recent_games
@@ -0,0 +1,178 @@
+# Trained player-stat prediction model
+# Features are rolling form statistics built from league game logs. One linear regressor
+# per target stat is trained offline (train_player_model.py) and folded into a single
+# coefficient matrix, so serving a prediction is a row lookup plus one matrix product.
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from lazy_imports import lazy_module
+
+# Only the training helpers need pandas; serving uses the numpy arrays alone
+pd = lazy_module("pandas")
+
+PLAYER_MODEL_PATH = os.getenv(
+    "PLAYER_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "models", "player_stats.joblib")
+)
+
+# Box-score columns summarized into form features
+FORM_STATS = ["PTS", "REB", "AST", "MIN"]
+ROLLING_WINDOWS = [5, 10]
+FEATURE_COLUMNS = (
+    [f"{stat.lower()}_avg" for stat in FORM_STATS]
+    + [f"{stat.lower()}_last{window}" for window in ROLLING_WINDOWS for stat in FORM_STATS]
+    + ["pts_std10", "fg_pct_avg", "fg3_pct_avg", "games_played"]
+)
+
+# Model outputs: next-game box score and rest-of-season per-game averages
+TARGETS = ["next_pts", "next_reb", "next_ast", "season_pts", "season_reb", "season_ast"]
+TARGET_STATS = {"next_pts": "PTS", "next_reb": "REB", "next_ast": "AST",
+                "season_pts": "PTS", "season_reb": "REB", "season_ast": "AST"}
+
+# Minimum games already played before a game is used as a training example
+MIN_GAMES_FOR_TRAINING = 3
+
+_GROUP_KEYS = ["PLAYER_ID", "SEASON_ID"]
+
+
+def _form_features(logs: pd.DataFrame) -> pd.DataFrame:
+    """Season-to-date and rolling form after each game (including that game)"""
+    keys = [logs[key] for key in _GROUP_KEYS]
+    features = pd.DataFrame(index=logs.index)
+    games = logs.groupby(_GROUP_KEYS, sort=False).cumcount() + 1
+
+    for stat in FORM_STATS:
+        values = logs[stat].astype(np.float64)
+        grouped = values.groupby(keys, sort=False)
+        features[f"{stat.lower()}_avg"] = grouped.cumsum() / games
+        for window in ROLLING_WINDOWS:
+            rolling = grouped.rolling(window, min_periods=1).mean()
+            features[f"{stat.lower()}_last{window}"] = rolling.reset_index(level=[0, 1], drop=True)
+
+    points = logs["PTS"].astype(np.float64).groupby(keys, sort=False)
+    features["pts_std10"] = points.rolling(10, min_periods=2).std().reset_index(level=[0, 1], drop=True).fillna(0.0)
+
+    for made, attempted, name in (("FGM", "FGA", "fg_pct_avg"), ("FG3M", "FG3A", "fg3_pct_avg")):
+        made_total = logs[made].astype(np.float64).groupby(keys, sort=False).cumsum()
+        attempted_total = logs[attempted].astype(np.float64).groupby(keys, sort=False).cumsum()
+        features[name] = (made_total / attempted_total.where(attempted_total > 0)).fillna(0.0)
+
+    features["games_played"] = games.astype(np.float64)
+    return features[FEATURE_COLUMNS]
+
+
+def _sorted_logs(game_logs: pd.DataFrame) -> pd.DataFrame:
+    logs = game_logs.copy()
+    logs["GAME_DATE"] = pd.to_datetime(logs["GAME_DATE"])
+    return logs.sort_values(_GROUP_KEYS + ["GAME_DATE", "GAME_ID"]).reset_index(drop=True)
+
+
+def build_training_set(game_logs: pd.DataFrame):
+    """Return (features, targets, player_ids) with one row per player game, using only earlier games as input"""
+    logs = _sorted_logs(game_logs)
+    # Shift by one game so each row only sees the form going *into* that game
+    features = _form_features(logs).groupby([logs[key] for key in _GROUP_KEYS], sort=False).shift(1)
+
+    targets = pd.DataFrame(index=logs.index)
+    for target in TARGETS:
+        stat = logs[TARGET_STATS[target]].astype(np.float64)
+        if target.startswith("next_"):
+            targets[target] = stat
+        else:
+            # Mean of this game and every remaining game of the season
+            reversed_stat = stat.iloc[::-1]
+            grouped = reversed_stat.groupby([logs[key].iloc[::-1] for key in _GROUP_KEYS], sort=False)
+            targets[target] = (grouped.cumsum() / (grouped.cumcount() + 1)).iloc[::-1]
+
+    usable = features["games_played"].ge(MIN_GAMES_FOR_TRAINING) & features.notna().all(axis=1)
+    player_ids = logs.loc[usable, "PLAYER_ID"].to_numpy(dtype=np.int64)
+    return features[usable].reset_index(drop=True), targets[usable].reset_index(drop=True), player_ids
+
+
+def latest_features(game_logs: pd.DataFrame):
+    """Return (player_ids, features) describing each player's form after their latest game"""
+    logs = _sorted_logs(game_logs)
+    latest_season = logs["SEASON_ID"].max()
+    features = _form_features(logs)
+    last_rows = logs[logs["SEASON_ID"] == latest_season].groupby("PLAYER_ID", sort=True).tail(1).index
+    player_ids = logs.loc[last_rows, "PLAYER_ID"].to_numpy(dtype=np.int64)
+    order = np.argsort(player_ids)
+    return player_ids[order], features.loc[last_rows].to_numpy(dtype=np.float64)[order]
+
+
+class PlayerStatsModel:
+    """Loaded model artifact: per-player feature snapshot plus folded linear coefficients"""
+
+    def __init__(self, artifact: dict, path=None):
+        self.path = path
+        self.version = artifact["version"]
+        self.trained_at = artifact["trained_at"]
+        self.seasons = list(artifact["seasons"])
+        self.feature_columns = list(artifact["feature_columns"])
+        self.targets = list(artifact["targets"])
+        self.coef = artifact["coef"]  # (n_features, n_targets)
+        self.intercept = artifact["intercept"]  # (n_targets,)
+        self.metrics = artifact["metrics"]
+        self.player_ids = artifact["player_ids"]  # sorted, (n_players,)
+        self.features = artifact["features"]  # (n_players, n_features)
+        self._target_index = {target: i for i, target in enumerate(self.targets)}
+        self._feature_index = {column: i for i, column in enumerate(self.feature_columns)}
+
+    def rows_for(self, player_ids) -> np.ndarray:
+        """Snapshot row index per player ID, -1 where the player is unknown"""
+        player_ids = np.asarray(player_ids, dtype=np.int64)
+        positions = np.searchsorted(self.player_ids, player_ids)
+        positions = np.minimum(positions, len(self.player_ids) - 1)
+        found = self.player_ids[positions] == player_ids
+        return np.where(found, positions, -1)
+
+    def has_player(self, player_id) -> bool:
+        return bool(self.rows_for([player_id])[0] >= 0)
+
+    def predict_rows(self, rows) -> np.ndarray:
+        """Predict every target for snapshot rows at once; returns (n_rows, n_targets)"""
+        return np.maximum(self.features[rows] @ self.coef + self.intercept, 0.0)
+
+    def confidence(self, games_played: np.ndarray) -> np.ndarray:
+        """Next-game confidence: held-out R² of the next-game models, discounted for small samples"""
+        r2 = np.mean([self.metrics[target]["r2"] for target in self.targets if target.startswith("next_")])
+        return np.clip(0.5 + 0.45 * r2 * np.minimum(games_played / 20.0, 1.0), 0.5, 0.95)
+
+    def target(self, predictions: np.ndarray, name: str) -> np.ndarray:
+        return predictions[:, self._target_index[name]]
+
+    def feature(self, rows, name: str) -> np.ndarray:
+        return self.features[rows, self._feature_index[name]]
+
+    def info(self):
+        return {
+            "version": self.version,
+            "trained_at": self.trained_at,
+            "seasons": self.seasons,
+            "players": int(len(self.player_ids)),
+            "targets": self.targets,
+            "metrics": self.metrics
+        }
+
+
+def load_player_model(path=PLAYER_MODEL_PATH, mmap_mode="r"):
+    """Load a trained model artifact; with mmap_mode its arrays are mapped, not copied"""
+    import joblib
+    return PlayerStatsModel(joblib.load(path, mmap_mode=mmap_mode), path=path)
+
+
+def save_player_model(artifact: dict, path=PLAYER_MODEL_PATH):
+    """Write an artifact atomically so a running server never sees a half-written file
+
+    Saved uncompressed: joblib can only memory-map arrays from uncompressed files.
+    """
+    import joblib
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    joblib.dump(artifact, temporary_path)
+    os.replace(temporary_path, path)
@@ -0,0 +1,77 @@
+# Compact columnar registry of every NBA player from the nba_api static data
+# players.get_players() builds one dict per player (thousands of them) in every worker.
+# This registry keeps one column per field instead: a sorted int64 ID array, a bool array
+# and tuples referencing the name strings nba_api already holds (never copied), with small
+# __slots__ records created only when a caller asks for a player.
+
+import numpy as np
+
+
+class PlayerRecord:
+    """One player, materialized on demand"""
+
+    __slots__ = ("id", "full_name", "first_name", "last_name", "is_active")
+
+    def __init__(self, player_id, full_name, first_name, last_name, is_active):
+        self.id = player_id
+        self.full_name = full_name
+        self.first_name = first_name
+        self.last_name = last_name
+        self.is_active = is_active
+
+    def to_dict(self):
+        """Same shape as an nba_api players.get_players() entry"""
+        return {
+            "id": self.id,
+            "full_name": self.full_name,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "is_active": self.is_active
+        }
+
+
+class PlayerRegistry:
+    """Read-only player columns sorted by player ID"""
+
+    def __init__(self, rows):
+        """rows: (id, last_name, first_name, full_name, is_active) as in nba_api's static data"""
+        rows = sorted(rows, key=lambda row: row[0])
+        self.ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        self.is_active = np.fromiter((bool(row[4]) for row in rows), dtype=bool, count=len(rows))
+        # The tuples point at the strings in nba_api's table, so names are stored once per process
+        self.last_names = tuple(row[1] for row in rows)
+        self.first_names = tuple(row[2] for row in rows)
+        self.full_names = tuple(row[3] for row in rows)
+
+    @classmethod
+    def from_static(cls):
+        """Build from nba_api's bundled player table without creating per-player dicts"""
+        from nba_api.stats.library import data
+        return cls(data.players)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, player_id) -> int:
+        """Row of a player ID, or -1 when unknown"""
+        position = int(np.searchsorted(self.ids, player_id))
+        if position < len(self.ids) and self.ids[position] == player_id:
+            return position
+        return -1
+
+    def record(self, position) -> PlayerRecord:
+        return PlayerRecord(int(self.ids[position]), self.full_names[position], self.first_names[position],
+                            self.last_names[position], bool(self.is_active[position]))
+
+    def get(self, player_id):
+        position = self.position(player_id)
+        return self.record(position) if position >= 0 else None
+
+    def __contains__(self, player_id):
+        return self.position(player_id) >= 0
+
+    def __iter__(self):
+        return (self.record(position) for position in range(len(self.ids)))
+
+    def active_count(self) -> int:
+        return int(self.is_active.sum())
@@ -0,0 +1,173 @@
+# In-memory player name search for type-ahead
+# Built once over the PlayerRegistry columns. Name tokens are kept in one sorted array,
+# so every token starting with a query prefix is a contiguous range found by binary search
+# (a flattened trie). Queries with too few prefix matches fall back to trigram similarity,
+# which tolerates typos such as "lebrom".
+
+import heapq
+import re
+import unicodedata
+
+import numpy as np
+
+SEARCH_MAX_LIMIT = 50
+# Minimum trigram similarity (Dice coefficient) for a fuzzy match
+FUZZY_MIN_SIMILARITY = 0.45
+
+_DROPPED = re.compile(r"['’.]")
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase ASCII form of a name: accents folded, apostrophes and periods dropped"""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    return _SEPARATORS.sub(" ", _DROPPED.sub("", folded)).strip()
+
+
+# Normalized names only contain these characters, so a trigram packs into one integer
+_ALPHABET = " abcdefghijklmnopqrstuvwxyz0123456789"
+_CHAR_CODES = {char: code for code, char in enumerate(_ALPHABET)}
+_TRIGRAM_SPACE = len(_ALPHABET) ** 3
+
+
+def _trigram_codes(text: str):
+    padded = f"  {text} "
+    codes = [_CHAR_CODES[char] for char in padded]
+    return {(first * len(_ALPHABET) + second) * len(_ALPHABET) + third
+            for first, second, third in zip(codes, codes[1:], codes[2:])}
+
+
+class PlayerSearchIndex:
+    """Prefix and trigram index over the static player registry
+
+    Both indexes are CSR-style: a sorted key array plus offsets into one flat array of
+    player positions, so the whole index is a handful of contiguous arrays.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.names = [normalize_name(full_name) for full_name in registry.full_names]
+        self.player_ids = registry.ids
+        self.active = registry.is_active
+        # Tie-break order among equal scores: active players, then shorter names, then alphabetical
+        order = sorted(range(len(self.names)), key=lambda position: (not self.active[position], len(self.names[position]), self.names[position]))
+        self._tie_rank = [0] * len(order)
+        for rank, position in enumerate(order):
+            self._tie_rank[position] = rank
+
+        # Flattened trie: (token, player position, token position in the name), sorted by token
+        entries = []
+        for position, name in enumerate(self.names):
+            tokens = name.split()
+            for token_position, token in enumerate(tokens):
+                entries.append((token, position, token_position))
+            # "karl anthony towns" is also findable as "karlanthony"
+            if len(tokens) > 1:
+                entries.append(("".join(tokens), position, 0))
+        entries.sort()
+        tokens = np.array([token.encode("ascii") for token, _, _ in entries], dtype=bytes)
+        # Distinct tokens as one fixed-width byte array; binary search works on it directly
+        self._tokens, first_entry = np.unique(tokens, return_index=True)
+        self._token_offsets = np.append(first_entry, len(entries)).astype(np.int32)
+        self._token_players = np.array([position for _, position, _ in entries], dtype=np.int32)
+        self._token_positions = np.array([min(token_position, 127) for _, _, token_position in entries], dtype=np.int8)
+
+        gram_codes, gram_players = [], []
+        self._trigram_counts = np.zeros(len(self.names), dtype=np.int32)
+        for position, name in enumerate(self.names):
+            codes = _trigram_codes(name)
+            self._trigram_counts[position] = len(codes)
+            gram_codes.extend(codes)
+            gram_players.extend([position] * len(codes))
+        gram_codes = np.array(gram_codes, dtype=np.int32)
+        order = np.argsort(gram_codes, kind="stable")
+        self._gram_players = np.array(gram_players, dtype=np.int32)[order]
+        self._gram_offsets = np.searchsorted(gram_codes[order], np.arange(_TRIGRAM_SPACE + 1)).astype(np.int32)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_matches(self, token):
+        """{player position: best token position} for every name token starting with token"""
+        prefix = token.encode("ascii")
+        first = int(np.searchsorted(self._tokens, prefix))
+        last = int(np.searchsorted(self._tokens, prefix + b"\x7f"))
+        start, end = self._token_offsets[first], self._token_offsets[last]
+        players, token_positions = self._token_players[start:end], self._token_positions[start:end]
+        # Keep each player's earliest matching word
+        order = np.lexsort((token_positions, players))
+        players, token_positions = players[order], token_positions[order]
+        first_of_player = np.ones(len(players), dtype=bool)
+        first_of_player[1:] = players[1:] != players[:-1]
+        return dict(zip(players[first_of_player].tolist(), token_positions[first_of_player].tolist()))
+
+    def _allowed(self, position, active, team_player_ids):
+        if active is not None and self.active[position] != active:
+            return False
+        return team_player_ids is None or int(self.player_ids[position]) in team_player_ids
+
+    def search(self, query: str, limit: int = 10, active=None, team_player_ids=None, fuzzy=True):
+        """Ranked matches for a query; every query word must prefix some word of the name
+
+        active filters on is_active, team_player_ids restricts results to a set of player IDs.
+        """
+        normalized = normalize_name(query)
+        terms = normalized.split()
+        if not terms:
+            return []
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+
+        # Narrow with the longest term (fewest candidates), then check the others
+        terms_by_length = sorted(terms, key=len, reverse=True)
+        candidates = self._prefix_matches(terms_by_length[0])
+        for term in terms_by_length[1:]:
+            if not candidates:
+                break
+            other = self._prefix_matches(term)
+            candidates = {position: min(token_position, other[position])
+                          for position, token_position in candidates.items() if position in other}
+
+        scored = []
+        for position, token_position in candidates.items():
+            if not self._allowed(position, active, team_player_ids):
+                continue
+            name = self.names[position]
+            if name == normalized:
+                score = 1.0
+            elif name.startswith(normalized):
+                score = 0.9
+            elif token_position > 0:
+                score = 0.8  # last-name (or later word) prefix
+            else:
+                score = 0.7
+            scored.append((score, position, "prefix"))
+
+        if fuzzy and len(scored) < limit:
+            seen = {position for _, position, _ in scored}
+            for score, position in self._fuzzy_matches(normalized):
+                if position not in seen and self._allowed(position, active, team_player_ids):
+                    scored.append((score * 0.6, position, "fuzzy"))
+
+        tie_rank = self._tie_rank
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], tie_rank[item[1]]))
+        return [self._result(position, score, match) for score, position, match in best]
+
+    def _fuzzy_matches(self, normalized):
+        codes = _trigram_codes(normalized)
+        postings = [self._gram_players[self._gram_offsets[code]:self._gram_offsets[code + 1]] for code in codes]
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        similarity = 2.0 * shared / (self._trigram_counts + len(codes))
+        positions = np.flatnonzero(similarity >= FUZZY_MIN_SIMILARITY)
+        return [(float(similarity[position]), int(position)) for position in positions]
+
+    def _result(self, position, score, match):
+        player = self.registry.record(position)
+        return {
+            "player_id": player.id,
+            "full_name": player.full_name,
+            "first_name": player.first_name,
+            "last_name": player.last_name,
+            "is_active": player.is_active,
+            "match": match,
+            "score": round(score, 3)
+        }
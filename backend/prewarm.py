@@ -0,0 +1,88 @@
+# Background cache pre-warmer
+# The hot working set (30 teams, standings, leader categories) is known ahead of time,
+# so it is refreshed on a schedule instead of waiting for user traffic to miss the cache.
+
+import asyncio
+import os
+import time
+
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "1") != "0"
+# Upstream calls the warmer may issue per minute (kept well under the stats.nba.com limit)
+PREWARM_CALLS_PER_MINUTE = float(os.getenv("PREWARM_CALLS_PER_MINUTE", "20"))
+# Pause between full warm-up cycles; shorter than the team cache TTL so entries never go cold
+PREWARM_INTERVAL_SECONDS = float(os.getenv("PREWARM_INTERVAL_SECONDS", "300"))
+# Delay before the first cycle so startup is not slowed down
+PREWARM_INITIAL_DELAY_SECONDS = float(os.getenv("PREWARM_INITIAL_DELAY_SECONDS", "5"))
+
+
+class CacheWarmer:
+    """Runs a list of warm-up jobs in a loop, paced by the upstream calls they actually make"""
+
+    def __init__(self, jobs_factory, count_calls, calls_per_minute=PREWARM_CALLS_PER_MINUTE,
+                 interval=PREWARM_INTERVAL_SECONDS, initial_delay=PREWARM_INITIAL_DELAY_SECONDS):
+        """count_calls() is a context manager yielding {"calls": n} for the code it wraps
+        (UpstreamClient.count_calls), so user traffic during a job is not billed to it"""
+        self.jobs_factory = jobs_factory
+        self.count_calls = count_calls
+        self.calls_per_minute = calls_per_minute
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self._task = None
+        self.cycles = 0
+        self.jobs_run = 0
+        self.job_failures = 0
+        self.upstream_calls_made = 0
+        self.last_cycle_seconds = None
+        self.last_cycle_finished = None
+
+    async def run_cycle(self):
+        """Run every job once, sleeping after each job in proportion to its upstream calls"""
+        started = time.monotonic()
+        for name, job in self.jobs_factory():
+            with self.count_calls() as counter:
+                try:
+                    await job()
+                except Exception as e:
+                    self.job_failures += 1
+                    print(f"⚠️ Pre-warm job {name} failed: {e}")
+            self.jobs_run += 1
+            calls_made = counter["calls"]
+            if calls_made > 0:
+                self.upstream_calls_made += calls_made
+                await asyncio.sleep(calls_made * 60.0 / self.calls_per_minute)
+        self.cycles += 1
+        self.last_cycle_seconds = round(time.monotonic() - started, 1)
+        self.last_cycle_finished = time.time()
+
+    async def _run(self):
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            await self.run_cycle()
+            print(f"🔥 Cache pre-warm cycle {self.cycles} finished in {self.last_cycle_seconds}s")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "calls_per_minute": self.calls_per_minute,
+            "interval_seconds": self.interval,
+            "cycles": self.cycles,
+            "jobs_run": self.jobs_run,
+            "job_failures": self.job_failures,
+            "upstream_calls_made": self.upstream_calls_made,
+            "last_cycle_seconds": self.last_cycle_seconds,
+            "last_cycle_age_seconds": round(time.time() - self.last_cycle_finished, 1) if self.last_cycle_finished else None
+        }
@@ -0,0 +1,110 @@
+# Fast JSON responses backed by orjson
+# Payloads are serialized in a single C-speed pass with native NumPy support,
+# NaN written as null, and datetimes in ISO format.
+
+import functools
+import hashlib
+import math
+import sys
+
+import numpy as np
+import orjson
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(obj):
+    """Handle the types orjson does not serialize natively"""
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return value
+    # Pandas objects can only exist once pandas is imported; never import it just to check
+    pd = sys.modules.get("pandas")
+    if pd is None:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict("records")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+def etag_matches(if_none_match, etag) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+class PreparedJSON:
+    """A JSON body serialized once up front, with a strong ETag for conditional requests"""
+
+    def __init__(self, content):
+        self.body = dumps(content)
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+
+    def response(self, request=None) -> Response:
+        if request is not None and etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers={"ETag": self.etag})
+        return Response(self.body, media_type="application/json", headers={"ETag": self.etag})
+
+
+class NumpyORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, understanding NumPy scalars/arrays and NaN"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def _render_directly(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, Response):
+            return result
+        response = NumpyORJSONResponse(result)
+        # Carry over headers/status set on an injected `response: Response` parameter,
+        # which FastAPI only merges itself when the endpoint returns plain data
+        sub_response = kwargs.get("response")
+        if isinstance(sub_response, Response):
+            for name, value in sub_response.headers.items():
+                if name != "content-length":
+                    response.headers[name] = value
+            if sub_response.status_code:
+                response.status_code = sub_response.status_code
+        return response
+    return wrapper
+
+
+class ORJSONRoute(APIRoute):
+    """Route that renders plain endpoint results with orjson, skipping jsonable_encoder
+
+    FastAPI normally walks every returned dict with jsonable_encoder before the response
+    class sees it. Wrapping the endpoint so it returns a Response hands the payload to
+    orjson untouched. Module-level endpoint functions stay unwrapped, so internal callers
+    (batch lookups, predictions, the pre-warmer) still receive plain dicts.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        response_model = kwargs.get("response_model")
+        # Routes with an explicit response_model keep FastAPI's validation path
+        if response_model is None or isinstance(response_model, DefaultPlaceholder):
+            endpoint = _render_directly(endpoint)
+        super().__init__(path, endpoint, **kwargs)
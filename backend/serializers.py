@@ -0,0 +1,78 @@
+# Vectorized DataFrame-to-JSON serialization
+# Each endpoint declares its output fields once (source column, cast, rounding, NA default)
+# and whole frames are converted column by column into native Python types.
+
+from __future__ import annotations
+
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from lazy_imports import lazy_module
+
+pd = lazy_module("pandas")
+
+
+class Field(NamedTuple):
+    """One output field: where it comes from and how it is cast"""
+    name: str
+    source: Union[str, Callable[[pd.DataFrame], Any]]  # column name, or callable returning a column
+    cast: str = "str"  # "int", "float", "str" or "raw"
+    round: Optional[int] = None
+    default: Any = None
+    strip: bool = False
+    na_values: Tuple = ()  # extra values treated as missing (e.g. a 0 rank)
+
+
+def _source_values(df: pd.DataFrame, field: Field):
+    if callable(field.source):
+        return field.source(df)
+    if field.source not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[field.source]
+
+
+def _numeric_array(values) -> np.ndarray:
+    array = values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+    if array.dtype.kind in "iufb":
+        return array.astype(np.float64, copy=False)
+    # Object/string/nullable columns: coerce with NaN for anything non-numeric
+    return pd.to_numeric(pd.Series(array), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _column_values(df: pd.DataFrame, field: Field) -> List[Any]:
+    """Convert one column to a list of native Python values with NA replaced by the default"""
+    values = _source_values(df, field)
+
+    if field.cast in ("int", "float"):
+        numeric = _numeric_array(values)
+        na_mask = np.isnan(numeric)
+        if field.na_values:
+            na_mask |= np.isin(numeric, field.na_values)
+        if field.cast == "int":
+            result = np.where(na_mask, 0, numeric).astype(np.int64).tolist()
+        else:
+            if field.round is not None:
+                numeric = np.round(numeric, field.round)
+            result = numeric.tolist()
+    else:
+        array = values.to_numpy(dtype=object) if isinstance(values, pd.Series) else np.asarray(values, dtype=object)
+        na_mask = pd.isna(array)
+        if field.cast == "str":
+            result = [value.strip() for value in map(str, array)] if field.strip else list(map(str, array))
+        else:
+            result = array.tolist()
+
+    # Only NA positions (usually few or none) are touched one by one
+    for position in np.flatnonzero(na_mask):
+        result[position] = field.default
+    return result
+
+
+def frame_to_records(df: pd.DataFrame, fields: List[Field]) -> List[dict]:
+    """Serialize a whole DataFrame to a list of dicts of native Python types"""
+    if df.empty:
+        return []
+    names = [field.name for field in fields]
+    columns = [_column_values(df, field) for field in fields]
+    return [dict(zip(names, row)) for row in zip(*columns)]
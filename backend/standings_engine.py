@@ -0,0 +1,203 @@
+# League standings computed locally from ingested team game results
+# Conference and division membership come from NBA_TEAMS_DATA (via TEAM_INDEX) and results
+# from the game-log warehouse. Each new result only touches its team's record and the
+# rankings of that team's conference and division; unchanged rows are never rebuilt.
+
+import threading
+from bisect import insort
+
+from team_index import TEAM_INDEX
+
+# NBA_TEAMS_DATA conference names -> the LeagueStandings "Conference" values the frontend filters on
+STANDINGS_CONFERENCES = {"Eastern": "East", "Western": "West"}
+
+
+class _TeamRecord:
+    """Results of one team, kept sorted by game date"""
+
+    def __init__(self):
+        self.results = []  # (game_date, game_id, won)
+        self.wins = 0
+        self.losses = 0
+
+    def add(self, game_date, game_id, won):
+        insort(self.results, (game_date, game_id, won))
+        if won:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def last_10(self):
+        recent = [won for _, _, won in self.results[-10:]]
+        return f"{sum(recent)}-{len(recent) - sum(recent)}"
+
+    def streak(self):
+        if not self.results:
+            return "N/A"
+        latest = self.results[-1][2]
+        length = 0
+        for _, _, won in reversed(self.results):
+            if won != latest:
+                break
+            length += 1
+        return f"{'W' if latest else 'L'} {length}"
+
+
+class StandingsEngine:
+    """W/L, win%, conference/division rank, games behind, L10 and streak per team
+
+    Ranks order teams by win percentage, then wins; the NBA's head-to-head and
+    conference-record tiebreakers are not modelled.
+    """
+
+    def __init__(self, team_index=TEAM_INDEX):
+        self.team_index = team_index
+        self._lock = threading.Lock()
+        self.season = None
+        self._synced_at = None
+        self.updates = 0
+        self._reset(None)
+
+    def _reset(self, season):
+        self.season = season
+        self._synced_at = None
+        self.games_applied = 0
+        self._applied = set()
+        self._records = {team_id: _TeamRecord() for team_id in self.team_index.ids}
+        self._rows = {team_id: self._blank_row(team_id) for team_id in self.team_index.ids}
+        self._rank_all()
+        self._payload = None
+        self.last_game_date = None
+
+    def _blank_row(self, team_id):
+        info = self.team_index.by_id[team_id]
+        return {
+            "team_id": team_id,
+            "team_name": info["full_name"],
+            # Same values as the LeagueStandings payload: official nba_api abbreviations ("BKN")
+            "abbreviation": self.team_index.static_abbreviations.get(team_id, info["abbreviation"]),
+            "city": info["city"],
+            "nickname": info["nickname"],
+            "wins": 0,
+            "losses": 0,
+            "win_pct": 0.0,
+            "conf_rank": 99,
+            "division_rank": 99,
+            "conference": STANDINGS_CONFERENCES[self.team_index.conference_of[team_id]],
+            "games_behind": 0.0,
+            "last_10": "N/A",
+            "streak": "N/A",
+        }
+
+    # --- updates -----------------------------------------------------------------
+
+    def apply(self, results) -> int:
+        """Apply team game-log rows (TEAM_ID, GAME_ID, GAME_DATE, WL); already applied games are skipped
+
+        Returns the number of teams whose record changed.
+        """
+        if results is None or results.empty:
+            return 0
+        with self._lock:
+            affected = set()
+            game_dates = results["GAME_DATE"].astype(str).str[:10].tolist()
+            for team_id, game_id, game_date, result in zip(
+                results["TEAM_ID"].tolist(), results["GAME_ID"].tolist(), game_dates, results["WL"].tolist()
+            ):
+                team_id = int(team_id)
+                key = (str(game_id), team_id)
+                record = self._records.get(team_id)
+                # Unknown teams (e.g. exhibition opponents) and unfinished games carry no result
+                if record is None or key in self._applied or result not in ("W", "L"):
+                    continue
+                self._applied.add(key)
+                record.add(game_date, key[0], result == "W")
+                affected.add(team_id)
+                self.games_applied += 1
+                if self.last_game_date is None or game_date > self.last_game_date:
+                    self.last_game_date = game_date
+            if affected:
+                self._refresh(affected)
+            return len(affected)
+
+    def _refresh(self, affected):
+        for team_id in affected:
+            record, row = self._records[team_id], self._rows[team_id]
+            games = record.wins + record.losses
+            row["wins"] = record.wins
+            row["losses"] = record.losses
+            row["win_pct"] = round(record.wins / games, 3) if games else 0.0
+            row["last_10"] = record.last_10()
+            row["streak"] = record.streak()
+        for conference in {self.team_index.conference_of[team_id] for team_id in affected}:
+            self._rank_conference(conference)
+        for division in {self.team_index.division_of[team_id] for team_id in affected}:
+            self._rank(self.team_index.by_division[division], "division_rank")
+        self._payload = None
+        self.updates += 1
+
+    def _rank(self, team_ids, rank_field):
+        ordered = sorted(team_ids, key=self._sort_key)
+        for rank, team_id in enumerate(ordered, start=1):
+            self._rows[team_id][rank_field] = rank
+        return ordered
+
+    def _rank_conference(self, conference):
+        ordered = self._rank(self.team_index.by_conference[conference], "conf_rank")
+        leader = self._records[ordered[0]]
+        for team_id in ordered:
+            record = self._records[team_id]
+            self._rows[team_id]["games_behind"] = ((leader.wins - record.wins) + (record.losses - leader.losses)) / 2
+
+    def _rank_all(self):
+        for conference in self.team_index.by_conference:
+            self._rank_conference(conference)
+        for division_ids in self.team_index.by_division.values():
+            self._rank(division_ids, "division_rank")
+
+    def _sort_key(self, team_id):
+        row = self._rows[team_id]
+        return (-row["win_pct"], -row["wins"], row["team_name"])
+
+    def on_ingest(self, kind, season, new_rows, updated_at, previous_updated_at):
+        """GameLogWarehouse listener: apply just the newly stored team results"""
+        if kind == "team" and season == self.season:
+            self.apply(new_rows)
+            # Rows stored since the last sync (e.g. by another process) are left to sync()
+            if self._synced_at == previous_updated_at:
+                self._synced_at = updated_at
+
+    def sync(self, warehouse, season) -> bool:
+        """Catch up with the warehouse's results for one season (including other processes' ingestions)
+
+        Returns True when there are results to serve.
+        """
+        info = warehouse.season_info("team", season)
+        if info is None:
+            return False
+        if season != self.season:
+            with self._lock:
+                self._reset(season)
+        if info["updated_at"] != self._synced_at:
+            # Already applied games are skipped, so only unseen rows change anything
+            self.apply(warehouse.load("team", season))
+            self._synced_at = info["updated_at"]
+        return self.games_applied > 0
+
+    # --- reads -------------------------------------------------------------------
+
+    def standings(self):
+        """Rows ordered by conference and conference rank; rebuilt only after an update"""
+        with self._lock:
+            if self._payload is None:
+                rows = sorted(self._rows.values(), key=lambda row: (row["conference"], row["conf_rank"]))
+                self._payload = [dict(row) for row in rows]
+            return self._payload
+
+    def stats(self):
+        return {
+            "season": self.season,
+            "games_applied": self.games_applied,
+            "updates": self.updates,
+            "last_game_date": self.last_game_date
+        }
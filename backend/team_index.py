@@ -0,0 +1,95 @@
+# Immutable team index built once at import
+# Lookups by ID, abbreviation, conference and division, plus pre-serialized
+# response bodies for the static team routes.
+
+from types import MappingProxyType
+
+from nba_api.stats.static import teams
+
+from nba_teams_database import NBA_TEAMS_DATA
+from responses import PreparedJSON
+
+
+def _freeze(mapping):
+    return MappingProxyType(dict(mapping))
+
+
+class TeamIndex:
+    """Read-only lookups over NBA_TEAMS_DATA and the nba_api static team list"""
+
+    def __init__(self, teams_data, static_teams):
+        self.ids = tuple(sorted(teams_data, key=lambda team_id: teams_data[team_id]["basic_info"]["full_name"]))
+        self.by_id = _freeze({team_id: _freeze(teams_data[team_id]["basic_info"]) for team_id in self.ids})
+        self.by_abbreviation = _freeze({info["abbreviation"]: team_id for team_id, info in self.by_id.items()})
+        self.conference_of = _freeze({team_id: teams_data[team_id]["conference"] for team_id in self.ids})
+        self.division_of = _freeze({team_id: teams_data[team_id]["division"] for team_id in self.ids})
+        self.tier_of = _freeze({team_id: teams_data[team_id]["performance_tier"] for team_id in self.ids})
+
+        by_conference, by_division = {}, {}
+        for team_id in self.ids:
+            by_conference.setdefault(self.conference_of[team_id], []).append(team_id)
+            by_division.setdefault(self.division_of[team_id], []).append(team_id)
+        self.by_conference = _freeze({name: tuple(ids) for name, ids in by_conference.items()})
+        self.by_division = _freeze({name: tuple(ids) for name, ids in by_division.items()})
+
+        # Opponent and rival abbreviations used by the mock recent-form generator
+        self.abbreviations = tuple(self.by_id[team_id]["abbreviation"] for team_id in self.ids)
+        self.opponents_of = _freeze({
+            team_id: tuple(abbr for abbr in self.abbreviations if abbr != self.by_id[team_id]["abbreviation"])
+            for team_id in self.ids
+        })
+        self.rivals_of = _freeze({
+            team_id: tuple(self.by_id[rival]["abbreviation"] for rival in teams_data[team_id].get("rivalries", []) if rival in self.by_id)
+            for team_id in self.ids
+        })
+
+        # Official nba_api abbreviations (used for standings, which come from the NBA API)
+        self.static_abbreviations = _freeze({team["id"]: team["abbreviation"] for team in static_teams})
+
+        self.teams_response = PreparedJSON(self._teams_payload())
+        self.nba_teams_response = PreparedJSON(self._nba_teams_payload(static_teams))
+
+    def get(self, team_id):
+        return self.by_id.get(team_id)
+
+    def get_by_abbreviation(self, abbreviation):
+        team_id = self.by_abbreviation.get(abbreviation.upper())
+        return self.by_id.get(team_id) if team_id is not None else None
+
+    def _teams_payload(self):
+        teams_list = [
+            {
+                "id": team_id,
+                "full_name": self.by_id[team_id]["full_name"],
+                "abbreviation": self.by_id[team_id]["abbreviation"],
+                "city": self.by_id[team_id]["city"],
+                "nickname": self.by_id[team_id]["nickname"]
+            }
+            for team_id in self.ids
+        ]
+        return {"teams": teams_list, "count": len(teams_list)}
+
+    @staticmethod
+    def _nba_teams_payload(static_teams):
+        nba_teams = sorted(
+            (
+                {
+                    "id": team["id"],
+                    "full_name": team["full_name"],
+                    "abbreviation": team["abbreviation"],
+                    "city": team["city"],
+                    "nickname": team["nickname"]
+                }
+                for team in static_teams
+            ),
+            key=lambda team: team["full_name"]
+        )
+        return {
+            "teams": nba_teams,
+            "count": len(nba_teams),
+            "eastern_conference": nba_teams[:15],  # First 15 alphabetically (rough approximation)
+            "western_conference": nba_teams[15:]  # Last 15 alphabetically
+        }
+
+
+TEAM_INDEX = TeamIndex(NBA_TEAMS_DATA, teams.get_teams())
@@ -0,0 +1,131 @@
+# Offline training pipeline for the player prediction model
+#
+# Usage (from backend/):  python train_player_model.py [--seasons 2022-23 2023-24 2024-25]
+#                                                      [--output data/models/player_stats.joblib]
+#                                                      [--from-warehouse]
+#
+# One LeagueGameLog call per season returns every player's game log (the same rows as
+# PlayerGameLog, for the whole league at once). Per-target StandardScaler + Ridge models
+# are fitted, evaluated on held-out players and folded into one coefficient matrix.
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from nba_api.stats.endpoints import leaguegamelog
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import GroupShuffleSplit
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from game_log_warehouse import GameLogWarehouse
+from player_model import (
+    FEATURE_COLUMNS, PLAYER_MODEL_PATH, TARGETS,
+    build_training_set, latest_features, save_player_model
+)
+from upstream_http import install_pooled_session
+
+DEFAULT_SEASONS = ["2022-23", "2023-24", "2024-25"]
+
+
+def fetch_game_logs(seasons, pause_seconds=1.0):
+    """Download regular-season player game logs, one request per season"""
+    frames = []
+    for season in seasons:
+        frame = leaguegamelog.LeagueGameLog(
+            season=season, player_or_team_abbreviation="P",
+            season_type_all_star="Regular Season", timeout=60
+        ).get_data_frames()[0]
+        print(f"📥 {season}: {len(frame)} player games")
+        frames.append(frame)
+        time.sleep(pause_seconds)  # Stay polite with stats.nba.com
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_warehouse_logs(seasons):
+    """Read player game logs already ingested by game_log_warehouse.py instead of downloading them"""
+    warehouse = GameLogWarehouse()
+    frames = []
+    for season in seasons:
+        frame = warehouse.load("player", season)
+        if frame is None:
+            raise SystemExit(f"❌ Season {season} is not in the warehouse; run game_log_warehouse.py --seasons {season}")
+        print(f"🗄️ {season}: {len(frame)} player games from the warehouse")
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def fold_pipeline(pipeline):
+    """Fold StandardScaler + Ridge into plain (coef, intercept) on raw features"""
+    scaler, ridge = pipeline[0], pipeline[-1]
+    coef = ridge.coef_ / scaler.scale_
+    intercept = ridge.intercept_ - np.dot(scaler.mean_, coef)
+    return coef, intercept
+
+
+def train(game_logs, alpha=1.0, test_size=0.2, random_state=42):
+    features, targets, player_ids = build_training_set(game_logs)
+    print(f"🧮 Training on {len(features)} player games with {len(FEATURE_COLUMNS)} features")
+    X = features[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    y = targets[TARGETS].to_numpy(dtype=np.float64)
+    # Hold out whole players: a player's games share rolling form, so a random row split
+    # would score the model on near-copies of its training rows
+    splitter = GroupShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+    train_rows, test_rows = next(splitter.split(X, groups=player_ids))
+    X_train, X_test, y_train, y_test = X[train_rows], X[test_rows], y[train_rows], y[test_rows]
+
+    coef = np.zeros((len(FEATURE_COLUMNS), len(TARGETS)))
+    intercept = np.zeros(len(TARGETS))
+    metrics = {}
+    for i, target in enumerate(TARGETS):
+        pipeline = make_pipeline(StandardScaler(), Ridge(alpha=alpha))
+        pipeline.fit(X_train, y_train[:, i])
+        predicted = pipeline.predict(X_test)
+        metrics[target] = {
+            "mae": round(float(mean_absolute_error(y_test[:, i], predicted)), 3),
+            "r2": round(float(r2_score(y_test[:, i], predicted)), 3)
+        }
+        coef[:, i], intercept[i] = fold_pipeline(pipeline)
+        print(f"   {target:<11} MAE {metrics[target]['mae']:6.2f}   R² {metrics[target]['r2']:.3f}")
+    return coef, intercept, metrics, len(features)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the player prediction model")
+    parser.add_argument("--seasons", nargs="+", default=DEFAULT_SEASONS)
+    parser.add_argument("--output", default=PLAYER_MODEL_PATH)
+    parser.add_argument("--alpha", type=float, default=1.0, help="Ridge regularization strength")
+    parser.add_argument("--from-warehouse", action="store_true", help="Train on locally ingested game logs")
+    args = parser.parse_args()
+
+    if args.from_warehouse:
+        game_logs = load_warehouse_logs(args.seasons)
+    else:
+        install_pooled_session()
+        game_logs = fetch_game_logs(args.seasons)
+    coef, intercept, metrics, samples = train(game_logs, alpha=args.alpha)
+    player_ids, snapshot = latest_features(game_logs)
+
+    trained_at = datetime.now().isoformat(timespec="seconds")
+    artifact = {
+        "version": datetime.now().strftime("%Y%m%d%H%M%S"),
+        "trained_at": trained_at,
+        "seasons": args.seasons,
+        "feature_columns": FEATURE_COLUMNS,
+        "targets": TARGETS,
+        "coef": coef,
+        "intercept": intercept,
+        "metrics": {**metrics, "samples": samples},
+        "player_ids": player_ids,
+        "features": snapshot,
+    }
+    # Atomic replace: running servers pick the new version up on their next reload check
+    save_player_model(artifact, args.output)
+    print(f"✅ Saved model for {len(player_ids)} players to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
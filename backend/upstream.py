@@ -0,0 +1,446 @@
+# Upstream fetch layer for nba_api calls
+# nba_api endpoint classes perform a blocking HTTP request inside their constructor,
+# so every call is pushed onto a bounded thread pool to keep the event loop free.
+# A global token bucket, jittered retries and a circuit breaker keep us from
+# amplifying stats.nba.com throttling into retry storms.
+
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+
+from upstream_http import UPSTREAM_POOLED_SESSION, install_pooled_session
+from upstream_store import open_default_store
+
+# Pool size and timeouts can be tuned per deployment through environment variables
+UPSTREAM_MAX_WORKERS = int(os.getenv("UPSTREAM_MAX_WORKERS", "8"))
+UPSTREAM_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", "20"))
+UPSTREAM_DEFAULT_CONCURRENCY = int(os.getenv("UPSTREAM_DEFAULT_CONCURRENCY", "2"))
+
+# Global request budget towards stats.nba.com (token bucket: sustained rate plus burst)
+UPSTREAM_RATE_PER_MINUTE = float(os.getenv("UPSTREAM_RATE_PER_MINUTE", "60"))
+UPSTREAM_RATE_BURST = int(os.getenv("UPSTREAM_RATE_BURST", "10"))
+# Retries on retryable errors with full-jitter exponential backoff
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+UPSTREAM_BACKOFF_BASE_SECONDS = float(os.getenv("UPSTREAM_BACKOFF_BASE_SECONDS", "0.5"))
+UPSTREAM_BACKOFF_MAX_SECONDS = float(os.getenv("UPSTREAM_BACKOFF_MAX_SECONDS", "8"))
+# Consecutive retryable failures that open the breaker, and how long it stays open
+UPSTREAM_BREAKER_THRESHOLD = int(os.getenv("UPSTREAM_BREAKER_THRESHOLD", "5"))
+UPSTREAM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("UPSTREAM_BREAKER_COOLDOWN_SECONDS", "30"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Upstream requests made on behalf of the current task (and tasks it starts); see count_calls
+_call_counter = contextvars.ContextVar("upstream_call_counter", default=None)
+
+# Per-endpoint concurrency limits (keyed by nba_api endpoint class name)
+ENDPOINT_CONCURRENCY = {
+    "LeagueStandings": 1,
+    "LeagueLeaders": 2,
+    "TeamDashboardByGeneralSplits": 3,
+    "CommonTeamRoster": 3,
+    "CommonPlayerInfo": 4,
+    "PlayerDashboardByYearOverYear": 4,
+}
+
+# Per-endpoint timeouts in seconds (falls back to UPSTREAM_TIMEOUT_SECONDS)
+ENDPOINT_TIMEOUTS = {
+    "LeagueStandings": 15,
+    "LeagueLeaders": 20,
+    "PlayerDashboardByYearOverYear": 15,
+}
+
+
+class UpstreamTimeoutError(Exception):
+    """Raised when an upstream call does not finish within its timeout"""
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised without calling upstream while the circuit breaker is open"""
+
+
+def is_retryable(error) -> bool:
+    """Timeouts, connection errors, throttling/5xx and non-JSON error pages are worth retrying"""
+    if isinstance(error, (UpstreamTimeoutError, requests.exceptions.ConnectionError,
+                          requests.exceptions.Timeout, json.JSONDecodeError)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def backoff_delay(attempt, base=UPSTREAM_BACKOFF_BASE_SECONDS, cap=UPSTREAM_BACKOFF_MAX_SECONDS) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Global upstream rate limit; callers reserve a token and sleep until it is due"""
+
+    def __init__(self, rate_per_minute=UPSTREAM_RATE_PER_MINUTE, burst=UPSTREAM_RATE_BURST):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+
+    def reserve(self) -> float:
+        """Take one token (possibly going into debt) and return how long to wait for it"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self):
+        delay = self.reserve()
+        self.acquired += 1
+        if delay > 0:
+            self.throttled += 1
+            self.total_wait_seconds += delay
+            self.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.waiting -= 1
+
+    def snapshot(self):
+        return {
+            "rate_per_minute": round(self.rate * 60, 1),
+            "burst": self.capacity,
+            "tokens_available": round(max(self.tokens, 0.0), 2),
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "total_wait_seconds": round(self.total_wait_seconds, 1)
+        }
+
+
+class CircuitBreaker:
+    """Opens after consecutive retryable failures and fails fast until a cooldown has passed
+
+    After the cooldown a single probe call is let through (half-open): success closes
+    the breaker, failure opens it for another cooldown.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=UPSTREAM_BREAKER_THRESHOLD, cooldown=UPSTREAM_BREAKER_COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.opened_at < self.cooldown:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self.probe_started = None
+        if self.state == self.HALF_OPEN:
+            # One probe at a time; a probe that never reported back expires after a cooldown
+            if self.probe_started is not None and now - self.probe_started < self.cooldown:
+                self.rejected += 1
+                return False
+            self.probe_started = now
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            print("✅ Upstream circuit breaker closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                print(f"🚨 Upstream circuit breaker opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.probe_started = None
+
+    def snapshot(self):
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "cooldown_seconds": self.cooldown,
+            "retry_in_seconds": retry_in,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class SingleFlight:
+    """Registry of in-flight calls so concurrent identical requests share one result"""
+
+    def __init__(self):
+        self._in_flight = {}
+        self.started = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _consume_result(task):
+        # Mark the exception as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def is_in_flight(self, key):
+        return key in self._in_flight
+
+    async def do(self, key, coro_factory):
+        """Run coro_factory() once per key; callers arriving meanwhile await the same task"""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.started += 1
+            task = asyncio.ensure_future(coro_factory())
+            self._in_flight[key] = task
+            task.add_done_callback(self._consume_result)
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shield so one disconnecting client does not cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    def snapshot(self):
+        return {
+            "in_flight": len(self._in_flight),
+            "started": self.started,
+            "coalesced": self.coalesced
+        }
+
+
+class UpstreamClient:
+    """Runs nba_api endpoint calls on a bounded thread pool with per-endpoint limits,
+    a global rate limit, retries with backoff and a circuit breaker"""
+
+    def __init__(self, max_workers=UPSTREAM_MAX_WORKERS, timeout=UPSTREAM_TIMEOUT_SECONDS,
+                 default_concurrency=UPSTREAM_DEFAULT_CONCURRENCY,
+                 endpoint_concurrency=None, endpoint_timeouts=None, store=None,
+                 rate_limiter=None, breaker=None, max_retries=UPSTREAM_MAX_RETRIES, http_session=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.default_concurrency = default_concurrency
+        self.endpoint_concurrency = dict(endpoint_concurrency or ENDPOINT_CONCURRENCY)
+        self.endpoint_timeouts = dict(endpoint_timeouts or ENDPOINT_TIMEOUTS)
+        self._executor = None
+        self._semaphores = {}
+        self.stats = defaultdict(lambda: {
+            "calls": 0, "errors": 0, "timeouts": 0, "in_flight": 0, "queued": 0, "coalesced": 0,
+            "retries": 0, "rejected": 0, "store_hits": 0, "stale_served": 0
+        })
+        self.single_flight = SingleFlight()
+        self.store = store
+        self.rate_limiter = rate_limiter or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.http_session = http_session
+
+    def _semaphore(self, endpoint_name):
+        semaphore = self._semaphores.get(endpoint_name)
+        if semaphore is None:
+            limit = self.endpoint_concurrency.get(endpoint_name, self.default_concurrency)
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[endpoint_name] = semaphore
+        return semaphore
+
+    def _get_executor(self):
+        # Created lazily so the client can be reused after a shutdown/startup cycle
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="nba-upstream")
+        return self._executor
+
+    @staticmethod
+    def _call(endpoint_cls, params, timeout):
+        # Runs on a worker thread: the constructor performs the HTTP request
+        return endpoint_cls(**params, timeout=timeout).get_data_frames()
+
+    async def fetch_frames(self, endpoint_cls, timeout=None, use_store=True, **params):
+        """Fetch an nba_api endpoint off the event loop and return its DataFrames
+
+        Concurrent calls for the same endpoint and parameters are coalesced into a
+        single upstream request. The returned frames are shared and must not be mutated.
+        use_store=False neither reads nor writes the persistent store.
+        """
+        frames, _ = await self.fetch_frames_timed(endpoint_cls, timeout, use_store=use_store, **params)
+        return frames
+
+    async def fetch_frames_timed(self, endpoint_cls, timeout=None, max_age=None, use_store=True, **params):
+        """Like fetch_frames, but returns (frames, fetched_at)
+
+        fetched_at is when the frames came from upstream, which is earlier than now for
+        persistent store hits and fallbacks. max_age (seconds) tightens the store's
+        freshness limit for this call.
+        """
+        endpoint_name = endpoint_cls.__name__
+        key = (endpoint_name, max_age, use_store) + tuple(sorted(params.items()))
+        if self.single_flight.is_in_flight(key):
+            self.stats[endpoint_name]["coalesced"] += 1
+        store = self.store if use_store else None
+        return await self.single_flight.do(key, lambda: self._fetch(endpoint_cls, timeout, params, max_age, store))
+
+    async def _fetch(self, endpoint_cls, timeout, params, max_age=None, store=None):
+        # Read through the persistent store: fresh entries skip upstream entirely,
+        # stale entries are kept as a fallback if the upstream call fails
+        endpoint_name = endpoint_cls.__name__
+        stored = None
+        if store is not None:
+            try:
+                stored = await asyncio.to_thread(store.get, endpoint_name, params)
+            except Exception as e:
+                print(f"⚠️ Could not read {endpoint_name} from persistent store: {e}")
+            fresh_for = store.max_age_for(endpoint_name)
+            if max_age is not None:
+                fresh_for = min(fresh_for, max_age)
+            if stored is not None and stored.age < fresh_for:
+                self.stats[endpoint_name]["store_hits"] += 1
+                return stored.frames, stored.fetched_at
+
+        try:
+            frames = await self._fetch_upstream(endpoint_cls, timeout, params)
+        except Exception as e:
+            if stored is None:
+                raise
+            print(f"⚠️ {endpoint_name} upstream failed ({e}); serving stored data {int(stored.age)}s old")
+            self.stats[endpoint_name]["stale_served"] += 1
+            return stored.frames, stored.fetched_at
+
+        fetched_at = time.time()
+        if store is not None:
+            try:
+                await asyncio.to_thread(store.put, endpoint_name, params, frames, fetched_at)
+            except Exception as e:
+                print(f"⚠️ Could not persist {endpoint_name} response: {e}")
+        return frames, fetched_at
+
+    async def _fetch_upstream(self, endpoint_cls, timeout, params):
+        endpoint_name = endpoint_cls.__name__
+        timeout = timeout or self.endpoint_timeouts.get(endpoint_name, self.timeout)
+        stats = self.stats[endpoint_name]
+
+        if not self.breaker.allow():
+            stats["rejected"] += 1
+            raise UpstreamUnavailableError(f"{endpoint_name} skipped: upstream circuit breaker is open")
+
+        semaphore = self._semaphore(endpoint_name)
+        stats["queued"] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            stats["queued"] -= 1
+        try:
+            attempt = 0
+            while True:
+                # The slot is held across backoff sleeps so retries cannot pile up
+                await self.rate_limiter.acquire()
+                try:
+                    frames = await self._attempt(endpoint_cls, params, timeout, stats)
+                except Exception as e:
+                    if not is_retryable(e):
+                        # Upstream answered; the failure is ours (bad params, parsing)
+                        self.breaker.record_success()
+                        raise
+                    self.breaker.record_failure()
+                    if attempt >= self.max_retries or self.breaker.state != CircuitBreaker.CLOSED:
+                        raise
+                    delay = backoff_delay(attempt)
+                    attempt += 1
+                    stats["retries"] += 1
+                    print(f"🔁 {endpoint_name} failed ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                else:
+                    self.breaker.record_success()
+                    return frames
+        finally:
+            semaphore.release()
+
+    async def _attempt(self, endpoint_cls, params, timeout, stats):
+        endpoint_name = endpoint_cls.__name__
+        stats["calls"] += 1
+        counter = _call_counter.get()
+        if counter is not None:
+            counter["calls"] += 1
+        stats["in_flight"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(self._call, endpoint_cls, params, timeout)
+            # Small grace period so the HTTP-level timeout normally fires first
+            return await asyncio.wait_for(loop.run_in_executor(self._get_executor(), call), timeout=timeout + 1)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            raise UpstreamTimeoutError(f"{endpoint_name} timed out after {timeout}s")
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            stats["in_flight"] -= 1
+
+    @contextmanager
+    def count_calls(self):
+        """Count the upstream requests made by this task and the tasks it starts
+
+        Yields {"calls": n}. Calls made for other requests at the same time are not
+        included, and neither are fetches this task only joined (single flight).
+        """
+        counter = {"calls": 0}
+        token = _call_counter.set(counter)
+        try:
+            yield counter
+        finally:
+            _call_counter.reset(token)
+
+    def total_calls(self):
+        """Total upstream requests issued so far (store hits and coalesced calls excluded)"""
+        return sum(counters["calls"] for counters in self.stats.values())
+
+    def snapshot(self):
+        """Return a copy of the per-endpoint call counters"""
+        return {
+            "max_workers": self.max_workers,
+            "queue_depth": sum(counters["queued"] for counters in self.stats.values()) + self.rate_limiter.waiting,
+            "rate_limit": self.rate_limiter.snapshot(),
+            "circuit_breaker": self.breaker.snapshot(),
+            "single_flight": self.single_flight.snapshot(),
+            "store": self.store.stats() if self.store is not None else None,
+            "http_pool": self.http_session.stats() if self.http_session is not None else None,
+            "endpoints": {name: dict(counters) for name, counters in self.stats.items()},
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        # Semaphores bind to the running event loop, so start fresh on the next startup
+        self._semaphores = {}
+        if self.http_session is not None:
+            self.http_session.close()
+
+
+# Shared client used by all API endpoints
+upstream = UpstreamClient(
+    store=open_default_store(),
+    http_session=install_pooled_session() if UPSTREAM_POOLED_SESSION else None
+)
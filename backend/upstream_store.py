@@ -0,0 +1,160 @@
+# Persistent on-disk store for raw nba_api responses
+# Holds upstream DataFrames in SQLite so a freshly (re)started process serves warm data.
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+UPSTREAM_STORE_PATH = os.getenv(
+    "UPSTREAM_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "upstream_cache.sqlite3")
+)
+
+# How long a stored response counts as fresh, per nba_api endpoint (seconds)
+STORE_DEFAULT_MAX_AGE = 1800
+STORE_MAX_AGE = {
+    "LeagueStandings": 900,
+    "LeagueLeaders": 1800,
+    "TeamDashboardByGeneralSplits": 1800,
+    "CommonTeamRoster": 6 * 3600,
+    "CommonPlayerInfo": 24 * 3600,
+    "PlayerDashboardByYearOverYear": 3600,
+}
+
+# Entries are kept as upstream-failure fallbacks for this many times their max age
+# (but at least STORE_MIN_RETENTION_SECONDS), then pruned
+STORE_RETENTION_FACTOR = float(os.getenv("UPSTREAM_STORE_RETENTION_FACTOR", "4"))
+STORE_MIN_RETENTION_SECONDS = float(os.getenv("UPSTREAM_STORE_MIN_RETENTION_SECONDS", str(24 * 3600)))
+# Hard cap on stored responses (e.g. one per player ever requested); the oldest go first
+STORE_MAX_ROWS = int(os.getenv("UPSTREAM_STORE_MAX_ROWS", "20000"))
+# Puts between prune passes (a pass also runs when the store is opened)
+STORE_PRUNE_EVERY = 200
+
+StoredFrames = namedtuple("StoredFrames", ["frames", "fetched_at", "age"])
+
+
+def _params_key(params: dict) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _season_of(params: dict) -> str:
+    return str(params.get("season") or params.get("season_nullable") or "current")
+
+
+class UpstreamStore:
+    """SQLite-backed store of upstream DataFrames keyed by endpoint, params and season"""
+
+    def __init__(self, path=UPSTREAM_STORE_PATH, max_age=None, max_rows=STORE_MAX_ROWS):
+        self.path = path
+        self.max_age = dict(max_age or STORE_MAX_AGE)
+        self.max_rows = max_rows
+        self.puts_since_prune = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS upstream_frames (
+                endpoint TEXT NOT NULL,
+                params TEXT NOT NULL,
+                season TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (endpoint, params, season)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS upstream_frames_fetched_at ON upstream_frames (fetched_at)")
+        self._conn.commit()
+        pruned = self.prune()
+        if pruned:
+            print(f"🧹 Pruned {pruned} expired upstream responses from the persistent store")
+
+    def max_age_for(self, endpoint_name: str) -> float:
+        return self.max_age.get(endpoint_name, STORE_DEFAULT_MAX_AGE)
+
+    def retention_for(self, endpoint_name: str) -> float:
+        return max(STORE_RETENTION_FACTOR * self.max_age_for(endpoint_name), STORE_MIN_RETENTION_SECONDS)
+
+    def prune(self) -> int:
+        """Delete entries past their retention, then the oldest beyond max_rows; returns rows deleted"""
+        now = time.time()
+        with self._lock:
+            deleted = 0
+            endpoints = [row[0] for row in self._conn.execute("SELECT DISTINCT endpoint FROM upstream_frames")]
+            for endpoint in endpoints:
+                deleted += self._conn.execute(
+                    "DELETE FROM upstream_frames WHERE endpoint = ? AND fetched_at < ?",
+                    (endpoint, now - self.retention_for(endpoint))
+                ).rowcount
+            deleted += self._conn.execute(
+                "DELETE FROM upstream_frames WHERE rowid IN "
+                "(SELECT rowid FROM upstream_frames ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,)
+            ).rowcount
+            self._conn.commit()
+            self.puts_since_prune = 0
+        return deleted
+
+    def get(self, endpoint_name: str, params: dict):
+        """Return the stored frames with their age, or None if nothing is stored"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, payload FROM upstream_frames WHERE endpoint = ? AND params = ? AND season = ?",
+                (endpoint_name, _params_key(params), _season_of(params))
+            ).fetchone()
+        if row is None:
+            return None
+        fetched_at, payload = row
+        return StoredFrames(pickle.loads(payload), fetched_at, time.time() - fetched_at)
+
+    def put(self, endpoint_name: str, params: dict, frames, fetched_at=None):
+        payload = pickle.dumps(frames, protocol=pickle.HIGHEST_PROTOCOL)
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO upstream_frames (endpoint, params, season, fetched_at, payload) VALUES (?, ?, ?, ?, ?)",
+                (endpoint_name, _params_key(params), _season_of(params), fetched_at, payload)
+            )
+            self._conn.commit()
+            self.puts_since_prune += 1
+            prune_due = self.puts_since_prune >= STORE_PRUNE_EVERY
+        if prune_due:
+            self.prune()
+
+    def stats(self):
+        """Return per-endpoint entry counts and the age of the oldest/newest entries"""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT endpoint, COUNT(*), MIN(fetched_at), MAX(fetched_at) FROM upstream_frames GROUP BY endpoint"
+            ).fetchall()
+        return {
+            endpoint: {
+                "entries": count,
+                "oldest_age_seconds": round(now - oldest, 1),
+                "newest_age_seconds": round(now - newest, 1),
+                "max_age_seconds": self.max_age_for(endpoint)
+            }
+            for endpoint, count, oldest, newest in rows
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_default_store():
+    """Open the store at UPSTREAM_STORE_PATH, or return None if persistence is disabled/unavailable"""
+    if os.getenv("UPSTREAM_STORE_ENABLED", "1") == "0":
+        return None
+    try:
+        return UpstreamStore()
+    except Exception as e:
+        print(f"⚠️ Persistent upstream store unavailable ({e}); continuing without it")
+        return None